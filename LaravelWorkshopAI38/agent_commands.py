@@ -20,6 +20,7 @@ from .form_request_generator import generate_form_requests
 from .form_request_refactor import build_refactor_plan, apply_controller_refactors, build_controller_refactor_diffs
 from .worker_manager import get_worker_manager
 from .project_indexer import build_project_index
+from .settings_cache import get_setting
 
 
 class LaravelWorkshopAgentGenerateFeatureCommand(sublime_plugin.WindowCommand):
@@ -499,9 +500,8 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
         if not project_root:
             return
 
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        max_workers = settings.get("scanner_max_workers", 8)
-        excludes = settings.get("scanner_excludes", ["vendor", "node_modules", ".git", "storage", "bootstrap", "build", "dist"]) or []
+        max_workers = get_setting("scanner_max_workers", 8)
+        excludes = get_setting("scanner_excludes", ["vendor", "node_modules", ".git", "storage", "bootstrap", "build", "dist"]) or []
 
         if intent.get("type") == "nplusone":
             UIHelpers.append_to_tab(self.output_tab, "\n🔎 Scanning project for N+1...\n")
@@ -511,12 +511,7 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                     # Build index (routes/relations) to enrich scan
                     idx = build_project_index(project_root, max_workers=max_workers, excludes=excludes)
                     UIHelpers.append_to_tab(self.output_tab, "Index: models={0}, routes={1}\n".format(idx.get("stats", {}).get("models", 0), idx.get("stats", {}).get("routes", 0)))
-                    rel_map = idx.get("relations_map", {}) or {}
-                    known_rel = []
-                    for arr in rel_map.values():
-                        for r in arr or []:
-                            if r and r not in known_rel:
-                                known_rel.append(r)
+                    known_rel = idx.get("known_relations") or []
                     summary = scan_project(project_root, max_workers=max_workers, excludes=excludes, known_relations=known_rel)
                     UIHelpers.append_to_tab(self.output_tab, "Total files: {0}\n".format(summary.get("total_files", 0)))
                     UIHelpers.append_to_tab(self.output_tab, "Problem files: {0}\n".format(summary.get("problem_files", 0)))
@@ -541,9 +536,10 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                                     # Show first diff preview
                                     for d in diffs[:1]:
                                         changes = d.get("changes") or []
-                                        UIHelpers.append_to_tab(self.output_tab, "Suggested changes: {0}\n".format(len(changes)))
+                                        lines = ["Suggested changes: {0}\n".format(len(changes))]
                                         for (ln, old, new) in changes[:5]:
-                                            UIHelpers.append_to_tab(self.output_tab, "  • L{0}: {1}→ {2}\n".format(ln + 1, old.strip()[:120], new.strip()[:120]))
+                                            lines.append("  • L{0}: {1}→ {2}\n".format(ln + 1, old.strip()[:120], new.strip()[:120]))
+                                        UIHelpers.append_to_tab(self.output_tab, "".join(lines))
                                     return
 
                         items = [[rels[i]] for i in range(len(rels))]
@@ -593,9 +589,8 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                     idx = build_project_index(project_root, max_workers=max_workers, excludes=excludes)
                     UIHelpers.append_to_tab(self.output_tab, "Index: models={0}, routes={1}\n".format(idx.get("stats", {}).get("models", 0), idx.get("stats", {}).get("routes", 0)))
                     summary = scan_project_for_controller_validation(project_root, max_workers=max_workers, excludes=excludes)
-                    UIHelpers.append_to_tab(self.output_tab, summary.get("message", "") + "\n\n")
-                    UIHelpers.append_to_tab(self.output_tab, "Total controllers: {0}\n".format(summary.get("total_controllers", 0)))
-                    UIHelpers.append_to_tab(self.output_tab, "Problem files: {0}\n".format(summary.get("problem_files", 0)))
+                    UIHelpers.append_to_tab(self.output_tab, "{0}\n\nTotal controllers: {1}\nProblem files: {2}\n".format(
+                        summary.get("message", ""), summary.get("total_controllers", 0), summary.get("problem_files", 0)))
                     results = [r for r in summary.get("results", []) if r.get("issues_found")]
                     if results:
                         files = [r.get("file") for r in results]
@@ -611,10 +606,10 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                             if not hits:
                                 UIHelpers.append_to_tab(self.output_tab, "No inline validation found.\n")
                                 return
-                            for h in hits[:10]:
-                                UIHelpers.append_to_tab(self.output_tab, "  • L{0}: {1}\n".format(h.get("line"), (h.get("snippet") or "").strip()[:200]))
+                            lines = ["  • L{0}: {1}\n".format(h.get("line"), (h.get("snippet") or "").strip()[:200]) for h in hits[:10]]
                             if len(hits) > 10:
-                                UIHelpers.append_to_tab(self.output_tab, "  • ...more omitted\n")
+                                lines.append("  • ...more omitted\n")
+                            UIHelpers.append_to_tab(self.output_tab, "".join(lines))
 
                         items = [[rels[i]] for i in range(len(rels))]
                         self.window.show_quick_panel(items, on_pick_ctrl)
@@ -630,19 +625,20 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                                 created = res.get("created", [])
                                 skipped = res.get("skipped", [])
                                 errors = res.get("errors", [])
-                                UIHelpers.append_to_tab(self.output_tab, "\nGenerated FormRequest classes:\n")
+                                lines = ["\nGenerated FormRequest classes:\n"]
                                 for p in created:
                                     rel = UIHelpers.get_project_relative_path(p, project_root)
-                                    UIHelpers.append_to_tab(self.output_tab, "  • {0}\n".format(rel))
+                                    lines.append("  • {0}\n".format(rel))
                                 if skipped:
-                                    UIHelpers.append_to_tab(self.output_tab, "\nSkipped (already exists):\n")
+                                    lines.append("\nSkipped (already exists):\n")
                                     for p in skipped[:50]:
                                         rel = UIHelpers.get_project_relative_path(p, project_root)
-                                        UIHelpers.append_to_tab(self.output_tab, "  • {0}\n".format(rel))
+                                        lines.append("  • {0}\n".format(rel))
                                 if errors:
-                                    UIHelpers.append_to_tab(self.output_tab, "\nErrors:\n")
+                                    lines.append("\nErrors:\n")
                                     for e in errors[:50]:
-                                        UIHelpers.append_to_tab(self.output_tab, "  • {0}\n".format(e))
+                                        lines.append("  • {0}\n".format(e))
+                                UIHelpers.append_to_tab(self.output_tab, "".join(lines))
                                 sublime.status_message("FormRequest generation completed")
                             elif index == 1:
                                 # Preview diffs
@@ -652,12 +648,13 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                                 if not diffs:
                                     UIHelpers.append_to_tab(self.output_tab, "No changes detected for refactor.\n")
                                     return
+                                lines = []
                                 for d in diffs[:20]:
                                     rel = UIHelpers.get_project_relative_path(d.get("file"), project_root)
-                                    UIHelpers.append_to_tab(self.output_tab, "\n=== {0} ===\n".format(rel))
-                                    UIHelpers.append_to_tab(self.output_tab, d.get("diff", "") + "\n")
+                                    lines.append("\n=== {0} ===\n{1}\n".format(rel, d.get("diff", "")))
                                 if len(diffs) > 20:
-                                    UIHelpers.append_to_tab(self.output_tab, "\n...more diffs omitted\n")
+                                    lines.append("\n...more diffs omitted\n")
+                                UIHelpers.append_to_tab(self.output_tab, "".join(lines))
                                 sublime.status_message("Refactor preview generated")
                             elif index == 2:
                                 # Build and apply controller refactor plan
@@ -666,15 +663,16 @@ class LaravelWorkshopAgentChatCommand(sublime_plugin.WindowCommand):
                                 items = plan.get("items", [])
                                 UIHelpers.append_to_tab(self.output_tab, "Items to refactor: {0}\n".format(len(items)))
                                 res = apply_controller_refactors(plan)
-                                UIHelpers.append_to_tab(self.output_tab, "Applied: {0}\n".format(res.get("applied", 0)))
+                                lines = ["Applied: {0}\n".format(res.get("applied", 0))]
                                 for p in res.get("changed_files", [])[:100]:
                                     rel = UIHelpers.get_project_relative_path(p, project_root)
-                                    UIHelpers.append_to_tab(self.output_tab, "  • {0}\n".format(rel))
+                                    lines.append("  • {0}\n".format(rel))
                                 errs = res.get("errors", [])
                                 if errs:
-                                    UIHelpers.append_to_tab(self.output_tab, "\nErrors:\n")
+                                    lines.append("\nErrors:\n")
                                     for e in errs[:50]:
-                                        UIHelpers.append_to_tab(self.output_tab, "  • {0}\n".format(e))
+                                        lines.append("  • {0}\n".format(e))
+                                UIHelpers.append_to_tab(self.output_tab, "".join(lines))
                                 sublime.status_message("Controller refactor completed")
                             else:
                                 return
@@ -707,9 +705,8 @@ class LaravelWorkshopAgentScanProjectCommand(sublime_plugin.WindowCommand):
         if not project_root:
             return
 
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        max_workers = settings.get("scanner_max_workers", 8)
-        excludes = settings.get("scanner_excludes", ["vendor", "node_modules", ".git", "storage", "bootstrap", "build", "dist"]) or []
+        max_workers = get_setting("scanner_max_workers", 8)
+        excludes = get_setting("scanner_excludes", ["vendor", "node_modules", ".git", "storage", "bootstrap", "build", "dist"]) or []
 
         tab_manager = TabManager(window)
         output_tab = tab_manager.create_output_tab(
@@ -728,12 +725,7 @@ class LaravelWorkshopAgentScanProjectCommand(sublime_plugin.WindowCommand):
                 idx = build_project_index(project_root, max_workers=max_workers, excludes=excludes)
                 append("Index: models={0}, routes={1}".format(idx.get("stats", {}).get("models", 0), idx.get("stats", {}).get("routes", 0)))
                 append("Collecting files...")
-                rel_map = idx.get("relations_map", {}) or {}
-                known_rel = []
-                for arr in rel_map.values():
-                    for r in arr or []:
-                        if r and r not in known_rel:
-                            known_rel.append(r)
+                known_rel = idx.get("known_relations") or []
                 summary = scan_project(project_root, max_workers=max_workers, excludes=excludes, known_relations=known_rel)
                 append("Total files: {0}".format(summary.get("total_files", 0)))
                 append("Problem files: {0}".format(summary.get("problem_files", 0)))
@@ -1,6 +1,54 @@
+import io
+import mmap
 import os
 import re
-import sublime
+import functools
+import itertools
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from .settings_cache import get_setting
+
+# (class, project root, extensions) -> analyzer shared by every view of that project
+_ANALYZERS = {}
+
+# File reads for find_symbol_usages, shared by every caller; it only runs leaf
+# I/O tasks, so callers waiting on it from other pools cannot deadlock
+_SCAN_EXECUTOR = None
+_SCAN_EXECUTOR_LOCK = threading.Lock()
+
+_DECLARATION_RE = re.compile(r'(?:class|function|interface|trait)\s+([a-zA-Z0-9_]+)')
+_CLASS_NAME_RE = re.compile(r'\b([A-Z][a-zA-Z0-9_]+)\b')
+
+
+@functools.lru_cache(maxsize=64)
+def _symbol_usage_re(symbol):
+    """Compiled usage pattern for a symbol, built once per symbol."""
+    escaped = re.escape(symbol)
+    # Match symbol at word boundaries or as part of camelCase/compound names
+    return re.compile(
+        r'(?:\b' + escaped + r'\b|(?<=[a-z])' + escaped + r'(?=[A-Z]|[a-z])|' + escaped + r'(?=[A-Z][a-z]))'
+    )
+
+
+def _scan_executor():
+    global _SCAN_EXECUTOR
+    with _SCAN_EXECUTOR_LOCK:
+        if _SCAN_EXECUTOR is None:
+            _SCAN_EXECUTOR = ThreadPoolExecutor(
+                max_workers=ContextAnalyzer.SCAN_WORKERS, thread_name_prefix="LWAI-Scan"
+            )
+        return _SCAN_EXECUTOR
+
+
+def plugin_unloaded():
+    # Release the scan threads on package reload/disable
+    global _SCAN_EXECUTOR
+    with _SCAN_EXECUTOR_LOCK:
+        executor, _SCAN_EXECUTOR = _SCAN_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False)
 
 
 class ContextAnalyzer:
@@ -9,23 +57,41 @@ class ContextAnalyzer:
     Finds symbol usages across the project to provide better context for AI requests.
     """
     
+    # (root, file, mtime, size, text, ...) -> (symbol, usage_context), shared by all instances
+    CONTEXT_CACHE_SIZE = 256
+    # Leading bytes checked for NUL before a file is read in full
+    PEEK_SIZE = 4096
+    # Files at least this large are searched through a memory map instead of read
+    MMAP_THRESHOLD = 256 * 1024
+    # Files are read concurrently in ordered batches of SCAN_WORKERS * 4
+    SCAN_WORKERS = 8
+    _context_cache = OrderedDict()
+    _context_cache_lock = threading.Lock()
+    
     def __init__(self, project_root=None, code_file_extensions=None):
         self.project_root = project_root
         self.code_file_extensions = code_file_extensions or [".php", ".js", ".py"]
     
     @classmethod
     def from_view(cls, view):
-        """Create ContextAnalyzer instance from a Sublime Text view."""
+        """
+        Get the ContextAnalyzer for a Sublime Text view's project.
+        Instances hold no per-request state, so one is shared per project root.
+        """
         if not view:
             return cls()
-            
-        folders = view.window().folders()
+        
+        window = view.window()
+        folders = window.folders() if window else []
         project_root = folders[0] if folders else None
         
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        code_file_extensions = settings.get("code_file_extensions", [".php", ".js", ".py"])
+        code_file_extensions = tuple(get_setting("code_file_extensions", [".php", ".js", ".py"]))
         
-        return cls(project_root, code_file_extensions)
+        key = (cls, project_root, code_file_extensions)
+        analyzer = _ANALYZERS.get(key)
+        if analyzer is None:
+            analyzer = _ANALYZERS.setdefault(key, cls(project_root, code_file_extensions))
+        return analyzer
     
     def extract_symbol_from_text(self, text):
         """
@@ -35,12 +101,12 @@ class ContextAnalyzer:
             return None
             
         # Look for class, function, interface, trait declarations
-        match = re.search(r'(?:class|function|interface|trait)\s+([a-zA-Z0-9_]+)', text)
+        match = _DECLARATION_RE.search(text)
         if match:
             return match.group(1)
         
         # Look for capitalized words that might be class names
-        match = re.search(r'\b([A-Z][a-zA-Z0-9_]+)\b', text)
+        match = _CLASS_NAME_RE.search(text)
         if match:
             return match.group(1)
             
@@ -54,48 +120,27 @@ class ContextAnalyzer:
             return ""
         
         max_files = 10
-        files_found = 0
         contexts = []
+        extensions = tuple(self.code_file_extensions)
+        pattern = _symbol_usage_re(symbol)
+        needle = symbol.encode('utf-8')
         
-        for root, _, files in os.walk(self.project_root):
-            if files_found >= max_files:
+        def scan(file_path):
+            return self._file_usage_context(file_path, symbol, needle, pattern)
+        
+        # Reads release the GIL, so files are scanned in parallel; results are
+        # consumed in walk order, giving the same first max_files as a serial scan
+        candidates = self._iter_code_files(extensions)
+        executor = _scan_executor()
+        while len(contexts) < max_files:
+            batch = list(itertools.islice(candidates, self.SCAN_WORKERS * 4))
+            if not batch:
                 break
-                
-            for file in files:
-                if files_found >= max_files:
-                    break
-                    
-                if any(file.endswith(ext) for ext in self.code_file_extensions):
-                    file_path = os.path.join(root, file)
-                    try:
-                        with open(file_path, 'r', encoding='utf-8') as f:
-                            lines = f.readlines()
-                            matching_snippets = []
-                            
-                            for i, line in enumerate(lines):
-                                # Match symbol at word boundaries or as part of camelCase/compound names
-                                pattern = r'(?:\b' + re.escape(symbol) + r'\b|(?<=[a-z])' + re.escape(symbol) + r'(?=[A-Z]|[a-z])|' + re.escape(symbol) + r'(?=[A-Z][a-z]))'
-                                if re.search(pattern, line):
-                                    start = max(0, i - 2)
-                                    end = min(len(lines), i + 3)
-                                    snippet = "".join(lines[start:end])
-                                    matching_snippets.append(
-                                        "... (line {})\n{}".format(i + 1, snippet)
-                                    )
-                            
-                            if matching_snippets:
-                                relative_path = os.path.relpath(file_path, self.project_root)
-                                contexts.append(
-                                    "--- File: {}\n{}\n".format(
-                                        relative_path, 
-                                        "\n".join(matching_snippets)
-                                    )
-                                )
-                                files_found += 1
-                                
-                    except Exception:
-                        # Skip files that can't be read
-                        continue
+            for file_context in executor.map(scan, batch):
+                if file_context:
+                    contexts.append(file_context)
+                    if len(contexts) >= max_files:
+                        break
         
         if not contexts:
             return ""
@@ -105,6 +150,67 @@ class ContextAnalyzer:
             "\n".join(contexts)
         )
     
+    def _iter_code_files(self, extensions):
+        """Yields project files with one of the given extensions, in os.walk order."""
+        for root, _, files in os.walk(self.project_root):
+            for file in files:
+                if file.endswith(extensions):
+                    yield os.path.join(root, file)
+    
+    def _file_usage_context(self, file_path, symbol, needle, pattern):
+        """
+        Returns the usage snippets for one file, or None when it has no match.
+        The raw bytes are searched first; only files containing the symbol are decoded.
+        """
+        try:
+            with open(file_path, 'rb', buffering=0) as f:
+                data = f.read(self.PEEK_SIZE)
+                if b'\0' in data:
+                    # Binary file: stop after the peek
+                    return None
+                if len(data) == self.PEEK_SIZE:
+                    if os.fstat(f.fileno()).st_size >= self.MMAP_THRESHOLD:
+                        # Search the page cache in place; copy the file out only on a hit
+                        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                            if mm.find(needle) == -1:
+                                return None
+                            data = mm[:]
+                    else:
+                        data += f.read()
+        except (OSError, ValueError):
+            return None
+        
+        if needle not in data:
+            return None
+        
+        try:
+            # Same line splitting as text mode (universal newlines)
+            lines = io.StringIO(data.decode('utf-8'), newline=None).readlines()
+        except UnicodeDecodeError:
+            # Skip files that can't be read
+            return None
+        
+        matching_snippets = []
+        for i, line in enumerate(lines):
+            # Every match contains the literal symbol, so a plain
+            # substring test rejects most lines before the regex
+            if symbol in line and pattern.search(line):
+                start = max(0, i - 2)
+                end = min(len(lines), i + 3)
+                snippet = "".join(lines[start:end])
+                matching_snippets.append(
+                    "... (line {})\n{}".format(i + 1, snippet)
+                )
+        
+        if not matching_snippets:
+            return None
+        
+        relative_path = os.path.relpath(file_path, self.project_root)
+        return "--- File: {}\n{}\n".format(
+            relative_path, 
+            "\n".join(matching_snippets)
+        )
+    
     def get_project_context_for_symbol(self, symbol):
         """
         Orchestrates getting the project context for a given symbol.
@@ -124,19 +230,68 @@ class ContextAnalyzer:
             current_file_path: Path to current file for advanced context analysis
             use_advanced_context: Whether to use advanced multi-file context (None = auto-detect from settings)
         """
-        symbol = self.extract_symbol_from_text(text)
-        
         # Check if advanced context should be used
         if use_advanced_context is None:
-            settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-            use_advanced_context = settings.get("use_advanced_context", True)
+            use_advanced_context = get_setting("use_advanced_context", True)
+        
+        use_cache = get_setting("cache_context_analysis", True)
+        cache = self._context_cache
+        if use_cache:
+            key = self._context_cache_key(text, current_file_path, use_advanced_context)
+            with self._context_cache_lock:
+                cached = cache.get(key)
+                if cached is not None:
+                    cache.move_to_end(key)
+                    return cached
         
         if use_advanced_context and current_file_path:
-            return self.analyze_text_for_advanced_context(text, current_file_path)
+            result = self.analyze_text_for_advanced_context(text, current_file_path)
         else:
             # Fall back to basic context analysis
+            symbol = self.extract_symbol_from_text(text)
             usage_context = self.get_project_context_for_symbol(symbol)
-            return symbol, usage_context
+            result = (symbol, usage_context)
+        
+        if use_cache:
+            with self._context_cache_lock:
+                cache[key] = result
+                if len(cache) > self.CONTEXT_CACHE_SIZE:
+                    cache.popitem(last=False)
+        return result
+    
+    def _context_cache_key(self, text, current_file_path, use_advanced_context):
+        """
+        Build the cache key for a context analysis.
+        
+        Usages come from the whole project, so entries are mainly invalidated by
+        clear_context_cache() (on save and from the cache manager). The git index
+        mtime is folded in as a cheap signal for checkouts and pulls.
+        """
+        git_index_mtime = None
+        if self.project_root:
+            try:
+                git_index_mtime = os.stat(os.path.join(self.project_root, ".git", "index")).st_mtime_ns
+            except OSError:
+                pass
+        return (
+            self.project_root,
+            tuple(self.code_file_extensions),
+            current_file_path,
+            git_index_mtime,
+            bool(use_advanced_context),
+            text
+        )
+    
+    @classmethod
+    def clear_context_cache(cls):
+        """Forget every cached analysis, e.g. after project files changed."""
+        with cls._context_cache_lock:
+            cls._context_cache.clear()
+    
+    @classmethod
+    def context_cache_size(cls):
+        """Number of cached analyses."""
+        return len(cls._context_cache)
     
     def analyze_text_for_advanced_context(self, text, current_file_path):
         """
@@ -16,6 +16,8 @@ REQUEST_VALIDATE_RE = re.compile(r"\$request\s*->\s*validate\s*\(", re.IGNORECAS
 VALIDATOR_MAKE_RE = re.compile(r"Validator\s*::\s*make\s*\(", re.IGNORECASE)
 CONTROLLER_CLASS_RE = re.compile(r"class\s+[A-Za-z_][A-Za-z0-9_]*Controller\b")
 METHOD_SIG_RE = re.compile(r"function\s+[A-Za-z_][A-Za-z0-9_]*\s*\((?P<params>[^)]*)\)")
+METHOD_NAME_RE = re.compile(r"function\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(")
+ARRAY_LITERAL_RE = re.compile(r"\[([\s\S]*?)\]")
 FORM_REQUEST_HINT_RE = re.compile(r"\\?App\\\\Http\\\\Requests\\\\[A-Za-z_][A-Za-z0-9_]*Request|[A-Za-z_][A-Za-z0-9_]*Request\b")
 
 
@@ -33,13 +35,13 @@ def _collect_controller_files(project_root: str, excludes: Iterable[str]) -> Lis
 def _infer_method_name(signature_line: str | None) -> str | None:
     if not signature_line:
         return None
-    m = re.search(r"function\s+([A-Za-z_][A-Za-z0-9_]*)\s*\(", signature_line)
+    m = METHOD_NAME_RE.search(signature_line)
     return m.group(1) if m else None
 
 
 def _extract_rules_around(lines: List[str], start_index: int) -> str:
     """Best-effort extraction of array rules from inline validation starting at start_index (0-based)."""
-    buf = ""
+    buf_lines: List[str] = []
     open_paren = 0
     started = False
     for j in range(start_index, min(len(lines), start_index + 50)):
@@ -50,11 +52,12 @@ def _extract_rules_around(lines: List[str], start_index: int) -> str:
                 started = True
             elif ch == ')':
                 open_paren -= 1 if open_paren > 0 else 0
-        buf += ln + "\n"
+        buf_lines.append(ln)
         if started and open_paren == 0:
             break
+    buf = "\n".join(buf_lines)
     # Try to find the first array literal
-    m = re.search(r"\[([\s\S]*?)\]", buf)
+    m = ARRAY_LITERAL_RE.search(buf)
     if not m:
         return ""
     return "[" + m.group(1).strip() + "]"
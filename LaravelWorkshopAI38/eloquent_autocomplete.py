@@ -2,28 +2,65 @@ from __future__ import annotations
 
 import os
 import re
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import sublime
 import sublime_plugin
 
 from .context_analyzer import ContextAnalyzer
-from .ide_helper_indexer import build_eloquent_index
+from .ide_helper_indexer import get_eloquent_index
+from .settings_cache import get_setting
 
 PHP_VAR_PROP_RE = re.compile(r"\$([A-Za-z_][A-Za-z0-9_]*)->[A-Za-z_0-9]*$")
 PHP_VAR_ANNOT_RE = re.compile(r"@var\s+([A-Za-z_\\\\][A-Za-z0-9_\\\\]*)\s*\$([A-Za-z_][A-Za-z0-9_]*)")
 
 
 class EloquentAutocompleteListener(sublime_plugin.EventListener):
+    # view id -> whether the view is a PHP file; dropped when the file name may change
+    _activation_cache: Dict[int, bool] = {}
+    # model class -> completion items, valid for the index object they were built from
+    _model_completions: Dict[str, List[Tuple[str, str]]] = {}
+    _completions_index = None
+
+    def _completions_for(self, idx: Dict, cls: str) -> List[Tuple[str, str]]:
+        if self._completions_index is not idx:
+            # A rebuilt index is a new object; start over
+            EloquentAutocompleteListener._completions_index = idx
+            self._model_completions.clear()
+        completions = self._model_completions.get(cls)
+        if completions is None:
+            model_data = idx.get("models", {}).get(cls) or {}
+            # Index lists are already sorted by build_eloquent_index
+            completions = [(f"{p}\tproperty", p) for p in model_data.get("properties", [])]
+            completions.extend((f"{r}()\trelation", f"{r}()") for r in model_data.get("relations", []))
+            # scopes are typically referenced as where/with modifiers, we still expose for discoverability
+            completions.extend((f"{s}\tscope", s) for s in model_data.get("scopes", []))
+            self._model_completions[cls] = completions
+        return completions
+
+    def _should_activate(self, view: sublime.View) -> bool:
+        active = self._activation_cache.get(view.id())
+        if active is None:
+            active = (view.file_name() or "").endswith(".php")
+            self._activation_cache[view.id()] = active
+        return active
+
+    def on_load_async(self, view: sublime.View):
+        self._activation_cache.pop(view.id(), None)
+
+    def on_post_save_async(self, view: sublime.View):
+        self._activation_cache.pop(view.id(), None)
+
+    def on_close(self, view: sublime.View):
+        self._activation_cache.pop(view.id(), None)
+
     def on_query_completions(self, view: sublime.View, prefix: str, locations: List[int]):
         try:
-            settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-            if not settings.get("enable_eloquent_autocomplete", True):
+            if not get_setting("enable_eloquent_autocomplete", True):
                 return None
 
             # Only PHP files
-            fname = view.file_name() or ""
-            if not fname.endswith(".php"):
+            if not self._should_activate(view):
                 return None
 
             # Determine if we are after `$var->`
@@ -46,8 +83,10 @@ class EloquentAutocompleteListener(sublime_plugin.EventListener):
             if not project_root:
                 return None
 
-            # Build/load IDE helper index
-            idx = build_eloquent_index(project_root)
+            # IDE helper index is built off the UI thread; no completions until it is ready
+            idx = get_eloquent_index(project_root)
+            if idx is None:
+                return None
 
             # Attempt to infer class from @var annotations in the buffer (search recent 3000 chars)
             search_region = sublime.Region(max(0, line_region.begin() - 3000), pt)
@@ -62,19 +101,7 @@ class EloquentAutocompleteListener(sublime_plugin.EventListener):
                 candidate = var_name[:1].upper() + var_name[1:]
                 inferred_cls = f"App\\Models\\{candidate}"
 
-            model_data = idx.get("models", {}).get(inferred_cls) or {}
-            props = model_data.get("properties", [])
-            rels = model_data.get("relations", [])
-            scopes = model_data.get("scopes", [])
-
-            completions: List[Tuple[str, str]] = []
-            for p in sorted(props):
-                completions.append((f"{p}\tproperty", p))
-            for r in sorted(rels):
-                completions.append((f"{r}()\trelation", f"{r}()"))
-            for s in sorted(scopes):
-                # scopes are typically referenced as where/with modifiers, we still expose for discoverability
-                completions.append((f"{s}\tscope", s))
+            completions = self._completions_for(idx, inferred_cls)
 
             flags = sublime.INHIBIT_WORD_COMPLETIONS | sublime.INHIBIT_EXPLICIT_COMPLETIONS
             return (completions, flags) if completions else None
@@ -78,11 +78,8 @@ def generate_form_requests(project_root: str, validation_summary: Dict[str, Any]
 
         # If scanner provided methods per hit, generate per-method; else per-controller
         hits = r.get("inline_validation", []) or []
-        method_names = []
-        for h in hits:
-            m = h.get("method")
-            if m and m not in method_names:
-                method_names.append(m)
+        # Distinct method names in first-hit order
+        method_names = list(dict.fromkeys(m for m in (h.get("method") for h in hits) if m))
 
         target_classes: List[str] = []
         if method_names:
@@ -3,7 +3,6 @@ from __future__ import annotations
 import os
 import re
 from typing import Dict, List, Any
-import difflib
 
 REQUEST_TYPE_RE = re.compile(r"\\?Illuminate\\\\Http\\\\Request|Request\b")
 METHOD_SIG_RE = re.compile(r"function\s+([A-Za-z_][A-Za-z0-9_]*)\s*\((?P<params>[^)]*)\)")
@@ -12,6 +11,7 @@ VALIDATE_CALL_RE = re.compile(r"\$([a-zA-Z_][a-zA-Z0-9_]*)\s*->\s*validate\s*\(\
 VALIDATE_ANY_RE = re.compile(r"\$([a-zA-Z_][a-zA-Z0-9_]*)\s*->\s*validate\s*\(", re.MULTILINE)
 USE_REQUESTS_RE = re.compile(r"^use\s+App\\\\Http\\\\Requests\\\\", re.MULTILINE)
 PHP_OPEN_NAMESPACE_RE = re.compile(r"^namespace\s+[^;]+;", re.MULTILINE)
+CONTROLLER_NAME_RE = re.compile(r"class\s+([A-Za-z_][A-Za-z0-9_]*)Controller\b")
 
 
 def _preferred_request_class(method_name: str | None, controller_name: str | None) -> str:
@@ -25,7 +25,7 @@ def _preferred_request_class(method_name: str | None, controller_name: str | Non
 
 
 def _infer_controller_name(content: str) -> str | None:
-    m = re.search(r"class\s+([A-Za-z_][A-Za-z0-9_]*)Controller\b", content)
+    m = CONTROLLER_NAME_RE.search(content)
     return m.group(1) if m else None
 
 
@@ -145,6 +145,9 @@ def apply_controller_refactors(plan: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def build_controller_refactor_diffs(plan: Dict[str, Any]) -> List[Dict[str, Any]]:
+    # Only the refactor preview needs difflib; keep it out of plugin load
+    import difflib
+
     diffs: List[Dict[str, Any]] = []
     for item in plan.get("items", []):
         file_path = item.get("file")
@@ -5,8 +5,10 @@ import re
 import json
 import hashlib
 import time
-from typing import Dict, Any, List
-import sublime
+from typing import Dict, Any, List, Optional
+
+from .settings_cache import get_setting
+from .worker_manager import get_worker_manager
 
 IDE_HELPER_FILES = ["_ide_helper_models.php", "_ide_helper.php"]
 
@@ -16,10 +18,12 @@ SCOPE_RE = re.compile(r"@method\s+static\s+[^ ]+\s+scope(?P<name>[A-Za-z_][A-Za-
 CLASS_RE = re.compile(r"class\s+(?P<cls>[A-Za-z_][A-Za-z0-9_\\]*)")
 MODEL_CLASS_RE = re.compile(r"namespace\\s+App\\\\Models|class\s+[A-Za-z_][A-Za-z0-9_]*\s+extends\s+\\?Illuminate\\\\Database\\\\Eloquent\\\\Model")
 
+# project root -> most recently built index, served to completion queries
+_INDEX_MEMO: Dict[str, Dict[str, Any]] = {}
+
 
 def _cache_path_for_project(project_root: str) -> str:
-    settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-    cache_dir = settings.get("cache_directory", os.path.expanduser("~/.sublime_ollama_cache"))
+    cache_dir = get_setting("cache_directory", os.path.expanduser("~/.sublime_ollama_cache"))
     try:
         cache_dir = os.path.expanduser(cache_dir)
     except Exception:
@@ -49,8 +53,13 @@ def _save_cache(project_root: str, data: Dict[str, Any]):
         pass
 
 
+def _new_member_sets() -> Dict[str, set]:
+    return {"properties": set(), "relations": set(), "scopes": set()}
+
+
 def _parse_ide_helper(content: str) -> Dict[str, Any]:
-    models: Dict[str, Dict[str, Any]] = {}
+    # Member names are collected into sets; build_eloquent_index() turns them into sorted lists
+    models: Dict[str, Dict[str, set]] = {}
     current_cls: str | None = None
     for line in content.splitlines():
         mcls = CLASS_RE.search(line)
@@ -59,28 +68,21 @@ def _parse_ide_helper(content: str) -> Dict[str, Any]:
             # Only consider Eloquent-like classes heuristically
             if current_cls is None or cls != current_cls:
                 current_cls = cls
-                models.setdefault(current_cls, {"properties": [], "relations": [], "scopes": []})
+                if current_cls not in models:
+                    models[current_cls] = _new_member_sets()
         if not current_cls:
             continue
+        members = models[current_cls]
         mp = PROPERTY_RE.search(line)
         if mp:
-            name = mp.group("name")
-            arr = models.setdefault(current_cls, {"properties": [], "relations": [], "scopes": []})
-            if name not in arr["properties"]:
-                arr["properties"].append(name)
+            members["properties"].add(mp.group("name"))
         mr = RELATION_HINT_RE.search(line)
         if mr:
-            name = mr.group("name")
-            arr = models.setdefault(current_cls, {"properties": [], "relations": [], "scopes": []})
-            if name not in arr["relations"]:
-                arr["relations"].append(name)
+            members["relations"].add(mr.group("name"))
         ms = SCOPE_RE.search(line)
         if ms:
-            name = ms.group("name")
             # scopes are typically referenced without 'scope' prefix when called as dynamic where
-            arr = models.setdefault(current_cls, {"properties": [], "relations": [], "scopes": []})
-            if name not in arr["scopes"]:
-                arr["scopes"].append(name)
+            members["scopes"].add(ms.group("name"))
     return {"models": models}
 
 
@@ -112,18 +114,28 @@ def build_eloquent_index(project_root: str) -> Dict[str, Any]:
             continue
         parsed = _parse_ide_helper(content)
         for cls, data in parsed.get("models", {}).items():
-            agg = aggregated["models"].setdefault(cls, {"properties": [], "relations": [], "scopes": []})
+            agg = aggregated["models"].get(cls)
+            if agg is None:
+                aggregated["models"][cls] = data
+                continue
             for k in ("properties", "relations", "scopes"):
-                for v in data.get(k, []) or []:
-                    if v not in agg[k]:
-                        agg[k].append(v)
+                agg[k] |= data[k]
+
+    # Sort member names once here so completion queries can list them as-is,
+    # tallying the stats in the same pass
+    total_properties = total_relations = 0
+    for agg in aggregated["models"].values():
+        for k in ("properties", "relations", "scopes"):
+            agg[k] = sorted(agg[k])
+        total_properties += len(agg["properties"])
+        total_relations += len(agg["relations"])
 
     out = {
         "models": aggregated["models"],
         "stats": {
             "model_classes": len(aggregated["models"]),
-            "properties": sum(len(v.get("properties", [])) for v in aggregated["models"].values()),
-            "relations": sum(len(v.get("relations", [])) for v in aggregated["models"].values()),
+            "properties": total_properties,
+            "relations": total_relations,
         },
         "generated_at": int(time.time()),
         "mtimes": mtimes_new,
@@ -132,4 +144,38 @@ def build_eloquent_index(project_root: str) -> Dict[str, Any]:
         _save_cache(project_root, out)
     except Exception:
         pass
+    _INDEX_MEMO[project_root] = out
     return out
+
+
+def _helper_mtimes(project_root: str) -> Dict[str, float]:
+    mtimes: Dict[str, float] = {}
+    for fname in IDE_HELPER_FILES:
+        path = os.path.join(project_root, fname)
+        try:
+            mtimes[path] = os.path.getmtime(path)
+        except OSError:
+            continue
+    return mtimes
+
+
+def warm_eloquent_index(project_root: str):
+    """(Re)build the index in the background; concurrent requests per project are coalesced."""
+    return get_worker_manager().submit(
+        build_eloquent_index,
+        project_root,
+        priority=1,
+        key=f"eloquent_index:{project_root}",
+    )
+
+
+def get_eloquent_index(project_root: str) -> Optional[Dict[str, Any]]:
+    """Return the in-memory index without blocking.
+
+    A missing or outdated index is rebuilt in the background; until that
+    finishes the previous index (or None) is returned.
+    """
+    idx = _INDEX_MEMO.get(project_root)
+    if idx is None or idx.get("mtimes") != _helper_mtimes(project_root):
+        warm_eloquent_index(project_root)
+    return idx
@@ -9,6 +9,8 @@ import sublime_plugin
 import html
 import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from typing import List, Dict, Optional
 
 from .laravel_workshop_api import create_api_client_from_settings
@@ -37,6 +39,139 @@ except Exception:
     create_default_tools = None
 
 from .ui_helpers import UIHelpers
+from .settings_cache import get_setting
+
+# Agent runs can outlive their 60s wait by minutes, so they get their own small
+# pool instead of holding workers that completions and indexing rely on
+_AGENT_EXECUTOR = None
+_AGENT_EXECUTOR_LOCK = threading.Lock()
+
+
+def _agent_executor():
+    global _AGENT_EXECUTOR
+    with _AGENT_EXECUTOR_LOCK:
+        if _AGENT_EXECUTOR is None:
+            _AGENT_EXECUTOR = ThreadPoolExecutor(max_workers=2, thread_name_prefix="LWAI-Agent")
+        return _AGENT_EXECUTOR
+
+
+def plugin_unloaded():
+    # Release the agent threads on package reload/disable
+    global _AGENT_EXECUTOR
+    with _AGENT_EXECUTOR_LOCK:
+        executor, _AGENT_EXECUTOR = _AGENT_EXECUTOR, None
+    if executor is not None:
+        executor.shutdown(wait=False)
+
+# Static parts of the (legacy) phantom chat markup, built once at import
+_CHAT_INPUT_HTML = """
+        <body id="ollama-chat">
+            <style>
+                body {
+                    font-family: system-ui;
+                    padding: 10px;
+                    background-color: var(--background);
+                    border: 1px solid var(--bluish);
+                    border-radius: 4px;
+                    margin: 5px 0;
+                }
+                .prompt {
+                    color: var(--foreground);
+                    font-size: 0.9rem;
+                }
+            </style>
+            <div class="prompt">💬 Type your message in the input panel below...</div>
+        </body>
+        """
+
+_CHAT_USER_MESSAGE_HTML = """
+                <div class="message user-message">
+                    <div class="message-header">👤 You</div>
+                    <div class="message-content">{content}</div>
+                </div>
+                """
+
+_CHAT_AI_MESSAGE_HTML = """
+                <div class="message ai-message">
+                    <div class="message-header">🤖 AI</div>
+                    <div class="message-content">{content}</div>
+                </div>
+                """
+
+_CHAT_HTML_TEMPLATE = """
+        <body id="ollama-chat">
+            <style>
+                body {{
+                    font-family: system-ui;
+                    padding: 10px;
+                    background-color: var(--background);
+                    border: 1px solid var(--bluish);
+                    border-radius: 4px;
+                    margin: 5px 0;
+                    max-width: 600px;
+                }}
+                .message {{
+                    margin: 10px 0;
+                    padding: 8px;
+                    border-radius: 4px;
+                }}
+                .user-message {{
+                    background-color: color(var(--bluish) alpha(0.1));
+                    border-left: 3px solid var(--bluish);
+                }}
+                .ai-message {{
+                    background-color: color(var(--greenish) alpha(0.1));
+                    border-left: 3px solid var(--greenish);
+                }}
+                .message-header {{
+                    font-weight: bold;
+                    font-size: 0.85rem;
+                    margin-bottom: 4px;
+                    color: var(--foreground);
+                }}
+                .message-content {{
+                    color: var(--foreground);
+                    font-size: 0.9rem;
+                    white-space: pre-wrap;
+                    word-wrap: break-word;
+                }}
+                .actions {{
+                    margin-top: 10px;
+                    padding-top: 10px;
+                    border-top: 1px solid var(--bluish);
+                }}
+                .action-link {{
+                    color: var(--bluish);
+                    text-decoration: none;
+                    margin-right: 15px;
+                    font-size: 0.85rem;
+                }}
+                .action-link:hover {{
+                    text-decoration: underline;
+                }}
+            </style>
+            <div class="chat-messages">
+                {messages}
+            </div>
+            <div class="actions">
+                <a href="continue" class="action-link">↩️ Continue</a>
+                <a href="clear" class="action-link">🗑️ Clear</a>
+                <a href="close" class="action-link">❌ Close</a>
+            </div>
+        </body>
+        """
+
+
+def _common_prefix_length(a, b):
+    """Length of the common prefix of two strings (binary search over C-level slice compares)"""
+    lo, hi = 0, min(len(a), len(b))
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if a[:mid] == b[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return lo
 
 
 class InlineChatManager:
@@ -50,6 +185,10 @@ class InlineChatManager:
         self.context_cache = {}
         self.history_file = None
         self.input_start = None  # type: Optional[int]
+        # [((role, timestamp, content), rendered_block)] parallel to chat_history
+        self._rendered_messages = []
+        # (view id, text) last written by _update_chat_display, for incremental redraws
+        self._displayed_content = None
         
         # Settings
         self.settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
@@ -251,6 +390,10 @@ class InlineChatManager:
         # Get AI response
         self._get_ai_response(user_message)
     
+    def _continue_chat_delay(self):
+        """Pause in ms before re-opening the chat input (0 = immediately)"""
+        return max(0, int(get_setting("continue_chat_delay_ms", 0)))
+    
     def _get_timestamp(self):
         """Get current timestamp"""
         from datetime import datetime
@@ -366,48 +509,28 @@ class InlineChatManager:
             print("Executing agent task...")
             crew = AgentCrew(agents=[agent], tasks=[task])
             
-            # Try to execute with timeout awareness
-            import threading
-            result_container = {'result': None, 'exception': None, 'done': False}
-            
-            def execute_agent():
-                try:
-                    print("Agent crew.kickoff() starting...")
-                    result_container['result'] = crew.kickoff()
-                    result_container['done'] = True
-                    print("Agent crew.kickoff() completed")
-                except Exception as e:
-                    print("Agent execution error: {0}".format(str(e)))
-                    result_container['exception'] = e
-                    result_container['done'] = True
-            
-            # Run in thread to avoid blocking
-            thread = threading.Thread(target=execute_agent)
-            thread.daemon = True
-            thread.start()
+            # Run on the agent pool; the Future carries the result or the exception
+            print("Agent crew.kickoff() starting...")
+            future = _agent_executor().submit(crew.kickoff)
             
             # Show progress while waiting (update every 5 seconds)
             # Use status bar only to avoid resetting prompt input
             elapsed = 0
-            while not result_container['done'] and elapsed < 60:
-                thread.join(timeout=5.0)
-                elapsed += 5
-                if not result_container['done']:
+            while True:
+                try:
+                    result = future.result(timeout=5.0)
+                    break
+                except FutureTimeoutError:
+                    elapsed += 5
+                    if elapsed >= 60:
+                        print("Agent timeout - falling back to regular response")
+                        raise TimeoutError("Agent execution timed out")
                     # Only update status bar, don't touch chat view to preserve prompt input
                     sublime.status_message("🔄 Agent analyzing project ({0}s)...".format(elapsed))
-            
-            # Final check
-            if not result_container['done']:
-                thread.join(timeout=1.0)  # One more second
-            
-            if not result_container['done']:
-                print("Agent timeout - falling back to regular response")
-                raise TimeoutError("Agent execution timed out")
-            
-            if result_container['exception']:
-                raise result_container['exception']
-            
-            result = result_container['result']
+                except Exception as e:
+                    print("Agent execution error: {0}".format(str(e)))
+                    raise
+            print("Agent crew.kickoff() completed")
             
             if not result:
                 print("Agent returned no result - falling back")
@@ -437,7 +560,7 @@ class InlineChatManager:
             self._save_history()
             
             # Ask for next input
-            sublime.set_timeout(lambda: self.show_input_prompt(), 100)
+            sublime.set_timeout(lambda: self.show_input_prompt(), self._continue_chat_delay())
             
         except TimeoutError:
             print("Agent timeout - using regular response")
@@ -565,6 +688,8 @@ class InlineChatManager:
         if not file_types:
             file_types = ['Controller.php', 'Model.php']
         
+        file_types = tuple(file_types)
+        
         # Scan for files
         scan_dirs = [
             os.path.join(project_root, 'app', 'Http', 'Controllers'),
@@ -584,7 +709,7 @@ class InlineChatManager:
                         continue
                     
                     for file in files:
-                        if any(file.endswith(ft) for ft in file_types):
+                        if file.endswith(file_types):
                             file_path = os.path.join(root, file)
                             try:
                                 with open(file_path, 'r', encoding='utf-8') as f:
@@ -623,8 +748,13 @@ class InlineChatManager:
         
         received_any = {'flag': False}
         error_occurred = {'flag': False}
+        refresh_pending = {'flag': False}
+        
+        def refresh_display():
+            refresh_pending['flag'] = False
+            self._update_chat_display()
         
-        # Streaming callback
+        # Streaming callback - redraws are coalesced to at most one per frame (~16ms)
         def content_callback(chunk):
             if self.chat_history:
                 if not received_any['flag']:
@@ -632,7 +762,9 @@ class InlineChatManager:
                     self.chat_history[-1]['content'] = ''
                 received_any['flag'] = True
                 self.chat_history[-1]['content'] += chunk
-                sublime.set_timeout(lambda: self._update_chat_display(), 0)
+                if not refresh_pending['flag']:
+                    refresh_pending['flag'] = True
+                    sublime.set_timeout(refresh_display, 16)
         
         # Run streaming request with timeout protection
         def run_stream():
@@ -657,7 +789,7 @@ class InlineChatManager:
             finally:
                 # Save history
                 self._save_history()
-                # Ask for next input after a short delay
+                # History is already saved, so ask for next input right away
                 def open_next_input():
                     # Update display first
                     if self.chat_history:
@@ -665,9 +797,9 @@ class InlineChatManager:
                     # Show status message
                     sublime.status_message("💬 Response complete! Press Cmd+K to continue chatting...")
                     # Then open input panel
-                    sublime.set_timeout(lambda: self.show_input_prompt(), 500)
+                    sublime.set_timeout(lambda: self.show_input_prompt(), self._continue_chat_delay())
                 
-                sublime.set_timeout(open_next_input, 300)  # 300ms delay to ensure response is saved
+                sublime.set_timeout(open_next_input, 0)
         
         # Start streaming async
         sublime.set_timeout_async(run_stream, 0)
@@ -689,7 +821,7 @@ class InlineChatManager:
                     self._update_chat_display()
                     self._save_history()
                     # Open input panel so user can continue
-                    sublime.set_timeout(lambda: self.show_input_prompt(), 200)
+                    sublime.set_timeout(lambda: self.show_input_prompt(), self._continue_chat_delay())
         
         sublime.set_timeout(watchdog, 20000)  # 20 seconds timeout
         
@@ -922,9 +1054,18 @@ When analyzing code:
         
         # Update view with messages
         self.chat_view.set_read_only(False)
-        self.chat_view.run_command('select_all')
-        self.chat_view.run_command('right_delete')
-        self.chat_view.run_command('append', {'characters': content})
+        displayed = self._displayed_content
+        if (not self.inline_input_mode and displayed is not None
+                and displayed[0] == self.chat_view.id() and self.chat_view.size() == len(displayed[1])):
+            # Only rewrite from the first changed character (normally the streaming reply)
+            start = _common_prefix_length(displayed[1], content)
+            if start < len(displayed[1]) or start < len(content):
+                self.chat_view.run_command('laravel_workshop_replace_chat_tail', {'start': start, 'characters': content[start:]})
+        else:
+            self.chat_view.run_command('select_all')
+            self.chat_view.run_command('right_delete')
+            self.chat_view.run_command('append', {'characters': content})
+        self._displayed_content = None if self.inline_input_mode else (self.chat_view.id(), content)
         
         # If inline input mode, append prompt and restore input
         if self.inline_input_mode:
@@ -1015,25 +1156,21 @@ Type your question and press Enter!
         lines.append("╚═══════════════════════════════════════╝")
         lines.append("")
         
-        for msg in self.chat_history:
-            role = msg['role']
-            content = msg['content']
-            timestamp = msg.get('timestamp', '')
-            
-            if role == 'user':
-                lines.append("┌─ 👤 You [{0}]".format(timestamp))
-                lines.append("│")
-                for line in content.split('\n'):
-                    lines.append("│  {0}".format(line))
-                lines.append("└─")
-                lines.append("")
+        # Only messages that changed since the last redraw are re-rendered;
+        # while streaming that is just the last one
+        rendered = self._rendered_messages
+        del rendered[len(self.chat_history):]
+        for index, msg in enumerate(self.chat_history):
+            key = (msg['role'], msg.get('timestamp', ''), msg['content'])
+            if index < len(rendered) and rendered[index][0] == key:
+                block = rendered[index][1]
             else:
-                lines.append("┌─ 🤖 AI [{0}]".format(timestamp))
-                lines.append("│")
-                for line in content.split('\n'):
-                    lines.append("│  {0}".format(line))
-                lines.append("└─")
-                lines.append("")
+                block = self._render_message(*key)
+                if index < len(rendered):
+                    rendered[index] = (key, block)
+                else:
+                    rendered.append((key, block))
+            lines.append(block)
         
         # Add continuation message if last message was from assistant
         if self.chat_history and self.chat_history[-1]['role'] == 'assistant':
@@ -1051,113 +1188,28 @@ Type your question and press Enter!
         
         return "\n".join(lines)
     
+    def _render_message(self, role, timestamp, content):
+        """Render one history message as a boxed block of display lines"""
+        label = "👤 You" if role == 'user' else "🤖 AI"
+        lines = ["┌─ {0} [{1}]".format(label, timestamp), "│"]
+        lines.extend("│  {0}".format(line) for line in content.split('\n'))
+        lines.append("└─")
+        lines.append("")
+        return "\n".join(lines)
+    
     def _create_input_html(self):
         """Create HTML for input prompt (not used anymore)"""
-        return """
-        <body id="ollama-chat">
-            <style>
-                body {
-                    font-family: system-ui;
-                    padding: 10px;
-                    background-color: var(--background);
-                    border: 1px solid var(--bluish);
-                    border-radius: 4px;
-                    margin: 5px 0;
-                }
-                .prompt {
-                    color: var(--foreground);
-                    font-size: 0.9rem;
-                }
-            </style>
-            <div class="prompt">💬 Type your message in the input panel below...</div>
-        </body>
-        """
+        return _CHAT_INPUT_HTML
     
     def _create_chat_html(self):
         """Create HTML for chat display"""
         messages_html = []
         
         for msg in self.chat_history[-10:]:  # Show last 10 messages
-            role = msg['role']
-            content = html.escape(msg['content'])
-            
-            if role == 'user':
-                messages_html.append("""
-                <div class="message user-message">
-                    <div class="message-header">👤 You</div>
-                    <div class="message-content">{content}</div>
-                </div>
-                """)
-            else:
-                messages_html.append("""
-                <div class="message ai-message">
-                    <div class="message-header">🤖 AI</div>
-                    <div class="message-content">{content}</div>
-                </div>
-                """)
+            template = _CHAT_USER_MESSAGE_HTML if msg['role'] == 'user' else _CHAT_AI_MESSAGE_HTML
+            messages_html.append(template.format(content=html.escape(msg['content'])))
         
-        return """
-        <body id="ollama-chat">
-            <style>
-                body {{
-                    font-family: system-ui;
-                    padding: 10px;
-                    background-color: var(--background);
-                    border: 1px solid var(--bluish);
-                    border-radius: 4px;
-                    margin: 5px 0;
-                    max-width: 600px;
-                }}
-                .message {{
-                    margin: 10px 0;
-                    padding: 8px;
-                    border-radius: 4px;
-                }}
-                .user-message {{
-                    background-color: color(var(--bluish) alpha(0.1));
-                    border-left: 3px solid var(--bluish);
-                }}
-                .ai-message {{
-                    background-color: color(var(--greenish) alpha(0.1));
-                    border-left: 3px solid var(--greenish);
-                }}
-                .message-header {{
-                    font-weight: bold;
-                    font-size: 0.85rem;
-                    margin-bottom: 4px;
-                    color: var(--foreground);
-                }}
-                .message-content {{
-                    color: var(--foreground);
-                    font-size: 0.9rem;
-                    white-space: pre-wrap;
-                    word-wrap: break-word;
-                }}
-                .actions {{
-                    margin-top: 10px;
-                    padding-top: 10px;
-                    border-top: 1px solid var(--bluish);
-                }}
-                .action-link {{
-                    color: var(--bluish);
-                    text-decoration: none;
-                    margin-right: 15px;
-                    font-size: 0.85rem;
-                }}
-                .action-link:hover {{
-                    text-decoration: underline;
-                }}
-            </style>
-            <div class="chat-messages">
-                {''.join(messages_html)}
-            </div>
-            <div class="actions">
-                <a href="continue" class="action-link">↩️ Continue</a>
-                <a href="clear" class="action-link">🗑️ Clear</a>
-                <a href="close" class="action-link">❌ Close</a>
-            </div>
-        </body>
-        """
+        return _CHAT_HTML_TEMPLATE.format(messages=''.join(messages_html))
     
     def clear_history(self):
         """Clear chat history"""
@@ -1220,6 +1272,13 @@ class LaravelWorkshopInlineChatCommand(sublime_plugin.WindowCommand):
             _chat_manager.start_chat(view)
 
 
+class LaravelWorkshopReplaceChatTailCommand(sublime_plugin.TextCommand):
+    """Replace the chat tab text from a point to the end (internal)"""
+    
+    def run(self, edit, start=0, characters=""):
+        self.view.replace(edit, sublime.Region(start, self.view.size()), characters)
+
+
 class LaravelWorkshopCloseChatCommand(sublime_plugin.TextCommand):
     """Close inline chat"""
     
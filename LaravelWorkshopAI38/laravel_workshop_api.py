@@ -1,11 +1,40 @@
 import json
+import errno
 import urllib.request
 import sublime
 import socket
+import threading
+import time
 import urllib.error
 
 # Import universal API client
-from .universal_api_client import create_universal_api_client
+from .universal_api_client import (
+    create_universal_api_client, dumps_json, loads_json, iter_response_lines, extract_json_string_field,
+    read_response_body
+)
+
+# Connection-error text, formatted once per failure instead of concatenated piecewise
+_CONNECTION_ERROR_TEMPLATE = (
+    "🔴 **Ollama Connection Error:** {reason}\n\n"
+    "**Troubleshooting steps:**\n"
+    "1. Make sure Ollama is installed: `ollama --version`\n"
+    "2. Start Ollama server: `ollama serve`\n"
+    "3. Check if the model is available: `ollama list`\n"
+    "4. Verify the URL in settings: {url}\n"
+    "5. Check firewall/network settings"
+)
+_CONNECTION_ERROR_WITH_SETTINGS_TEMPLATE = _CONNECTION_ERROR_TEMPLATE + (
+    "\n\n"
+    "**Current settings:**\n"
+    "- Model: {model}\n"
+    "- URL: {url}\n"
+    "- API Type: {api}"
+)
+_CONNECTION_ERROR_SHORT_TEMPLATE = "🔴 **Ollama Connection Error:** {reason}"
+_UNEXPECTED_ERROR_TEMPLATE = (
+    "🔴 **Unexpected Error:** {reason}\n\n"
+    "Please check the console for more details or report this issue."
+)
 
 
 class LaravelWorkshopApiClient:
@@ -14,46 +43,64 @@ class LaravelWorkshopApiClient:
     Centralizes request/response logic to avoid code duplication.
     """
     
-    def __init__(self, base_url, model, system_prompt, is_chat_api=True):
+    # Minimum seconds between console error dumps while the server stays down
+    ERROR_LOG_INTERVAL = 30
+    
+    def __init__(self, base_url, model, system_prompt, is_chat_api=True, keep_alive="5m", verbose_errors=True):
         self.base_url = base_url.rstrip('/')
         self.model = model
         self.system_prompt = system_prompt
         self.is_chat_api = is_chat_api
-    
-    def _get_api_endpoint(self):
-        """Get the appropriate API endpoint based on configuration."""
-        return "/api/chat" if self.is_chat_api else "/api/generate"
+        self.keep_alive = keep_alive
+        self.verbose_errors = verbose_errors
+        self._last_error_log = None
+        # Request invariants, computed once per client
+        self._full_url = self.base_url + ("/api/chat" if is_chat_api else "/api/generate")
+        self._system_message = {"role": "system", "content": system_prompt}
+        self._prompt_prefix = "{}\n\n".format(system_prompt)
     
     def _create_payload(self, prompt, stream=False, messages=None):
         """Create request payload based on API type."""
         if self.is_chat_api:
             if messages is None:
-                messages = [
-                    {"role": "system", "content": self.system_prompt},
-                    {"role": "user", "content": prompt}
-                ]
+                messages = [self._system_message, {"role": "user", "content": prompt}]
             return {
                 "model": self.model,
                 "messages": messages,
-                "stream": stream
+                "stream": stream,
+                "keep_alive": self.keep_alive
             }
         else:
-            full_prompt = "{}\n\n{}".format(self.system_prompt, prompt)
             return {
                 "model": self.model,
-                "prompt": full_prompt,
-                "stream": stream
+                "prompt": self._prompt_prefix + prompt,
+                "stream": stream,
+                "keep_alive": self.keep_alive
             }
     
+    def _log_error(self, message):
+        """Print to the console, at most once per ERROR_LOG_INTERVAL."""
+        now = time.monotonic()
+        if self._last_error_log is not None and now - self._last_error_log < self.ERROR_LOG_INTERVAL:
+            return
+        self._last_error_log = now
+        print("[Laravel Workshop AI] {0}".format(message))
+    
     def _make_request(self, payload):
         """Make HTTP request to Ollama API with improved error handling."""
-        full_url = self.base_url + self._get_api_endpoint()
+        full_url = self._full_url
         headers = {"Content-Type": "application/json"}
+        if payload.get("stream"):
+            # Ollama streams newline-delimited JSON; keep proxies from buffering it
+            headers["Accept"] = "application/x-ndjson"
+            headers["Cache-Control"] = "no-cache"
+        else:
+            headers["Accept-Encoding"] = "gzip"
         
         try:
             req = urllib.request.Request(
                 full_url,
-                data=json.dumps(payload).encode('utf-8'),
+                data=dumps_json(payload),
                 headers=headers
             )
             
@@ -61,11 +108,13 @@ class LaravelWorkshopApiClient:
             return urllib.request.urlopen(req, timeout=30)
             
         except urllib.error.URLError as e:
-            if isinstance(e.reason, socket.timeout):
+            # Match on exception classes and errno, not on (possibly localized) messages
+            reason = e.reason
+            if isinstance(reason, socket.timeout):
                 raise ConnectionError("Connection timeout to Ollama server at {0}".format(full_url))
-            elif "Connection refused" in str(e.reason):
+            elif isinstance(reason, ConnectionRefusedError) or getattr(reason, "errno", None) == errno.ECONNREFUSED:
                 raise ConnectionError("Ollama server is not running at {0}. Please start Ollama with 'ollama serve'".format(full_url))
-            elif "Name or service not known" in str(e.reason):
+            elif isinstance(reason, socket.gaierror):
                 raise ConnectionError("Cannot resolve Ollama server address: {0}".format(full_url))
             else:
                 raise ConnectionError("Failed to connect to Ollama server: {0}".format(e.reason))
@@ -79,12 +128,13 @@ class LaravelWorkshopApiClient:
         try:
             payload = self._create_payload(prompt, stream=False, messages=messages)
             response = self._make_request(payload)
-            response_text = response.read().decode("utf-8")
+            with response:
+                response_body = read_response_body(response)
             
             try:
-                response_data = json.loads(response_text)
+                response_data = loads_json(response_body)
             except json.JSONDecodeError as e:
-                print("[DEBUG] Invalid JSON from API: {0}\n{1}".format(e, response_text))
+                print("[DEBUG] Invalid JSON from API: {0}\n{1}".format(e, response_body.decode("utf-8", "replace")))
                 return None
             
             if self.is_chat_api:
@@ -93,26 +143,22 @@ class LaravelWorkshopApiClient:
                 return response_data.get('response', '')
                 
         except ConnectionError as e:
-            error_msg = "🔴 **Ollama Connection Error:** {0}\n\n".format(str(e))
-            error_msg += "**Troubleshooting steps:**\n"
-            error_msg += "1. Make sure Ollama is installed: `ollama --version`\n"
-            error_msg += "2. Start Ollama server: `ollama serve`\n"
-            error_msg += "3. Check if the model is available: `ollama list`\n"
-            error_msg += "4. Verify the URL in settings: {}\n".format(self.base_url)
-            error_msg += "5. Check firewall/network settings\n\n"
-            error_msg += "**Current settings:**\n"
-            error_msg += "- Model: {0}\n".format(self.model)
-            error_msg += "- URL: {0}\n".format(self.base_url)
-            error_msg += "- API Type: {0}".format('Chat' if self.is_chat_api else 'Generate')
+            if self.verbose_errors:
+                error_msg = _CONNECTION_ERROR_WITH_SETTINGS_TEMPLATE.format(
+                    reason=e,
+                    url=self.base_url,
+                    model=self.model,
+                    api='Chat' if self.is_chat_api else 'Generate'
+                )
+            else:
+                error_msg = _CONNECTION_ERROR_SHORT_TEMPLATE.format(reason=e)
             
-            print("[Laravel Workshop AI] {0}".format(error_msg))
+            self._log_error(error_msg)
             return error_msg
             
         except Exception as e:
-            error_msg = "🔴 **Unexpected Error:** {0}\n\n".format(str(e))
-            error_msg += "Please check the console for more details or report this issue."
-            print("[Laravel Workshop AI] Unexpected error: {0}".format(e))
-            return error_msg
+            self._log_error("Unexpected error: {0}".format(e))
+            return _UNEXPECTED_ERROR_TEMPLATE.format(reason=e)
     
     def make_streaming_request(self, prompt, callback, messages=None):
         """Make a streaming request and call callback for each chunk with improved error handling."""
@@ -120,10 +166,18 @@ class LaravelWorkshopApiClient:
             payload = self._create_payload(prompt, stream=True, messages=messages)
             response = self._make_request(payload)
             
+            stream_field = b'"content":"' if self.is_chat_api else b'"response":"'
             with response:
-                for line in response:
+                for line in iter_response_lines(response):
+                    # Plain token lines skip the JSON parse
+                    content = extract_json_string_field(line, stream_field)
+                    if content is not None:
+                        callback(content)
+                        if b'"done":true' in line:
+                            break
+                        continue
                     try:
-                        parsed = json.loads(line.decode("utf-8"))
+                        parsed = loads_json(line)
                         
                         content = None
                         if self.is_chat_api and "message" in parsed and "content" in parsed["message"]:
@@ -141,22 +195,48 @@ class LaravelWorkshopApiClient:
                         continue
                         
         except ConnectionError as e:
-            error_msg = "🔴 **Ollama Connection Error:** {0}\n\n".format(str(e))
-            error_msg += "**Troubleshooting steps:**\n"
-            error_msg += "1. Make sure Ollama is installed: `ollama --version`\n"
-            error_msg += "2. Start Ollama server: `ollama serve`\n"
-            error_msg += "3. Check if the model is available: `ollama list`\n"
-            error_msg += "4. Verify the URL in settings: {}\n".format(self.base_url)
-            error_msg += "5. Check firewall/network settings"
-            
-            callback("\n{0}".format(error_msg))
+            callback("\n" + _CONNECTION_ERROR_TEMPLATE.format(reason=e, url=self.base_url))
         except Exception as e:
             callback("\n🔴 **Unexpected Error:** {0}".format(str(e)))
 
 
+# One client shared by every command so keep-alive connections are reused;
+# dropped whenever the settings change
+_CLIENT_CACHE = {'client': None, 'settings': None}
+_CLIENT_LOCK = threading.Lock()
+_ON_CHANGE_KEY = "laravel_workshop_api_client"
+
+
+def _reset_api_client():
+    _CLIENT_CACHE['client'] = None
+
+
 def create_api_client_from_settings():
-    """Factory function to create API client from Sublime settings."""
-    settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
+    """Return the shared API client, building it from settings on first use."""
+    client = _CLIENT_CACHE['client']
+    if client is not None:
+        return client
+    with _CLIENT_LOCK:
+        client = _CLIENT_CACHE['client']
+        if client is None:
+            settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
+            if _CLIENT_CACHE['settings'] is None:
+                settings.add_on_change(_ON_CHANGE_KEY, _reset_api_client)
+                _CLIENT_CACHE['settings'] = settings
+            client = _CLIENT_CACHE['client'] = _build_api_client(settings)
+    return client
+
+
+def plugin_unloaded():
+    settings = _CLIENT_CACHE['settings']
+    if settings is not None:
+        settings.clear_on_change(_ON_CHANGE_KEY)
+    _CLIENT_CACHE['settings'] = None
+    _CLIENT_CACHE['client'] = None
+
+
+def _build_api_client(settings):
+    """Create an API client from Sublime settings."""
     
     # Check if using new universal API client
     provider = settings.get("ai_provider", None)
@@ -169,7 +249,9 @@ def create_api_client_from_settings():
         model = settings.get("model", "qwen2.5-coder")
         url_from_settings = settings.get("url", "http://127.0.0.1:11434")
         system_prompt = settings.get("system_prompt", "You are a Laravel PHP expert.")
+        keep_alive = settings.get("keep_alive", "5m")
+        verbose_errors = settings.get("verbose_errors", True)
         is_chat_api = "/api/chat" in url_from_settings
         base_url = url_from_settings.replace('/api/chat', '').replace('/api/generate', '')
         
-        return OllamaApiClient(base_url, model, system_prompt, is_chat_api)
\ No newline at end of file
+        return LaravelWorkshopApiClient(base_url, model, system_prompt, is_chat_api, keep_alive, verbose_errors)
\ No newline at end of file
@@ -6,15 +6,150 @@ Keeps only essential commands, everything else goes through AI Agents
 import sublime
 import sublime_plugin
 import os
-import threading
 import re
 import json
+import hashlib
+import html
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 
 # Import modular components
 from .laravel_workshop_api import create_api_client_from_settings
+from .universal_api_client import clear_response_cache
 from .context_analyzer import ContextAnalyzer
 from .ui_helpers import UIHelpers, TabManager
 from .response_processor import ResponseProcessor, StreamingResponseHandler
+from .worker_manager import get_worker_manager
+from .settings_cache import get_setting
+
+# file path -> (signature digest, AI analysis) from recent code smell runs, LRU-bounded;
+# written from the scan's worker threads
+_CODE_SMELL_CACHE = OrderedDict()
+_CODE_SMELL_CACHE_SIZE = 512
+_CODE_SMELL_CACHE_LOCK = threading.Lock()
+
+# worker key -> progress tab of the project scan running under it (UI thread only)
+_SCAN_TABS = {}
+
+def _focus_running_scan(window, key):
+    """Bring forward the tab of a scan already in flight; False if none is running."""
+    if not get_worker_manager().is_inflight(key):
+        _SCAN_TABS.pop(key, None)
+        return False
+    tab = _SCAN_TABS.get(key)
+    if tab is not None and tab.is_valid():
+        (tab.window() or window).focus_view(tab)
+    sublime.status_message("Scan already running for this project")
+    return True
+
+def _get_cached_api_client():
+    """Return the shared API client (rebuilt by the factory after settings edits)."""
+    return create_api_client_from_settings()
+
+
+# Offered when the AI request fails or its response can't be parsed
+_LARAVEL_FALLBACK_COMPLETIONS = (
+    'public function index() {',
+    'return view(\'',
+    'public function store(Request $request) {',
+    'return redirect()->route(\''
+)
+_PHP_FALLBACK_COMPLETIONS = (
+    'public function ',
+    'private function ',
+    'protected function ',
+    'if (',
+    'foreach ('
+)
+
+# Completion cache lookups across all views, shown by the cache manager
+_COMPLETION_STATS = {'hits': 0, 'misses': 0}
+
+# Patterns used to pull the JSON file list out of AI responses
+_JSON_FILES_RE = re.compile(r'\{.*"files".*\}', re.DOTALL)
+_JSON_FENCE_OBJECT_RE = re.compile(r'```json\s*(\{.*?\})\s*```', re.DOTALL)
+_JSON_FENCE_RE = re.compile(r'```json\s*(.*?)```', re.DOTALL)
+_ANY_FENCE_RE = re.compile(r'```\s*(.*?)```', re.DOTALL)
+_JSON_CONTENT_FIELD_RE = re.compile(r'("content"\s*:\s*")(.*?)("(?:\s*[,}\]]))', re.DOTALL)
+_PHP_METHOD_RE = re.compile(r'(?:public|private|protected)\s+function\s+\w+\s*\([^)]*\)\s*')
+
+# One alternation per project type; each named group is a pattern flag
+_PHP_PATTERN_RE = re.compile(
+    r'(?P<is_class>class )'
+    r'|(?P<is_function>function )'
+    r'|(?P<is_array>array\(|\[)'
+    r'|(?P<is_object>->)'
+    r'|(?P<is_static>::)'
+)
+_PHP_PATTERN_KEYS = ('is_class', 'is_function', 'is_array', 'is_object', 'is_static')
+
+_LARAVEL_PATTERN_RE = re.compile(
+    r'(?P<is_model>\bextends\s+\\?(?:\w+\\)*\w*Model\b)'
+    r'|(?P<is_controller>Controller)'
+    r'|(?P<is_migration>Schema::)'
+    r'|(?P<is_route>Route::)'
+    r'|(?P<is_eloquent>::)'
+)
+_LARAVEL_PATTERN_KEYS = ('is_model', 'is_controller', 'is_migration', 'is_route', 'is_eloquent')
+
+# project root -> 'laravel' | 'php', cleared when artisan/composer.json is saved
+_PROJECT_TYPE_CACHE = OrderedDict()
+_PROJECT_TYPE_CACHE_SIZE = 8
+
+
+# Checked in order, cheapest first; nested paths are only stat-ed when
+# their top-level entry is present in the root listing
+_LARAVEL_INDICATORS = (
+    ('artisan',),
+    ('app', 'Http', 'Controllers'),
+    ('routes', 'web.php'),
+    ('vendor', 'laravel'),
+)
+
+
+def _probe_project_type(project_root):
+    """Detect Laravel vs native PHP with a single directory listing."""
+    try:
+        with os.scandir(project_root) as it:
+            entries = {entry.name for entry in it}
+    except OSError:
+        return 'php'
+    
+    for parts in _LARAVEL_INDICATORS:
+        if parts[0] not in entries:
+            continue
+        if len(parts) == 1 or os.path.exists(os.path.join(project_root, *parts)):
+            return 'laravel'
+    
+    # Reading composer.json is the most expensive check, so it goes last
+    if 'composer.json' in entries:
+        try:
+            with open(os.path.join(project_root, 'composer.json'), 'r', encoding='utf-8', errors='ignore') as f:
+                if '"laravel/framework"' in f.read(4096):
+                    return 'laravel'
+        except OSError:
+            pass
+    
+    return 'php'
+
+
+class LaravelWorkshopProjectTypeListener(sublime_plugin.EventListener):
+    """Drop the cached project type when its marker files change"""
+    
+    def on_post_save_async(self, view):
+        file_name = view.file_name()
+        if file_name and os.path.basename(file_name) in ('artisan', 'composer.json'):
+            _PROJECT_TYPE_CACHE.pop(os.path.dirname(file_name), None)
+
+
+class LaravelWorkshopContextCacheListener(sublime_plugin.EventListener):
+    """Drop cached symbol usage context once project code changes"""
+    
+    def on_post_save_async(self, view):
+        # Usages are gathered across the project, so any saved file can stale them
+        if ContextAnalyzer.context_cache_size():
+            ContextAnalyzer.clear_context_cache()
 
 
 # ============================================================================
@@ -24,9 +159,11 @@ from .response_processor import ResponseProcessor, StreamingResponseHandler
 class LaravelWorkshopContextCommandBase(sublime_plugin.TextCommand):
     """Base class for commands that work with current cursor position or selection"""
     
+    MAX_LINE_CONTEXT_CHARS = 4096
+    
     def get_api_client(self):
         """Get configured API client instance."""
-        return create_api_client_from_settings()
+        return _get_cached_api_client()
     
     def get_context_text(self):
         """Get text from selection or current line/word"""
@@ -34,9 +171,15 @@ class LaravelWorkshopContextCommandBase(sublime_plugin.TextCommand):
         if selected_text.strip():
             return selected_text
         
-        # If no selection, get current line
+        # If no selection, get current line (bounded around the cursor for very long lines)
         cursor_pos = self.view.sel()[0].begin()
         line_region = self.view.line(cursor_pos)
+        if line_region.size() > self.MAX_LINE_CONTEXT_CHARS:
+            half = self.MAX_LINE_CONTEXT_CHARS // 2
+            line_region = sublime.Region(
+                max(line_region.begin(), cursor_pos - half),
+                min(line_region.end(), cursor_pos + half)
+            )
         line_text = self.view.substr(line_region)
         
         # If line is empty, get current word
@@ -55,29 +198,44 @@ class LaravelWorkshopContextCommandBase(sublime_plugin.TextCommand):
 class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
     """AI-powered PHP/Laravel code completion - specialized autocomplete"""
     
+    COMPLETION_CACHE_SIZE = 256
+    QUICK_CONTEXT_CHARS = 200
+    # Code before the cursor drives the completion; a short tail is enough after it
+    FULL_CONTEXT_BEFORE = 800
+    FULL_CONTEXT_AFTER = 200
+    FILE_SUFFIX_TYPES = (
+        ('Controller.php', 'controller'),
+        ('Model.php', 'model'),
+        ('.blade.php', 'blade'),
+    )
+    
+    # PHP patterns
+    php_patterns = {
+        'functions': ('array_', 'str_', 'preg_', 'file_', 'json_', 'date_'),
+        'classes': ('DateTime', 'PDO', 'Exception', 'ArrayObject', 'SplFileInfo'),
+        'keywords': ('public', 'private', 'protected', 'static', 'abstract', 'final'),
+        'constructs': ('i', 'else', 'foreach', 'while', 'for', 'switch', 'try', 'catch')
+    }
+    
+    # Laravel patterns
+    laravel_patterns = {
+        'models': ('User', 'Post', 'Comment', 'Category', 'Product'),
+        'controllers': ('UserController', 'PostController', 'AuthController'),
+        'methods': ('index', 'show', 'create', 'store', 'edit', 'update', 'destroy'),
+        'eloquent': ('find', 'where', 'get', 'first', 'create', 'update', 'delete'),
+        'blade': ('@extends', '@section', '@yield', '@i', '@foreach', '@include'),
+        'facades': ('Route', 'DB', 'Auth', 'Cache', 'Config', 'View', 'Mail')
+    }
+    
     def __init__(self, view):
         super().__init__(view)
-        self.api_client = None
-        self.completion_cache = {}
-        self.detection_cache = {}
-        
-        # PHP patterns
-        self.php_patterns = {
-            'functions': ['array_', 'str_', 'preg_', 'file_', 'json_', 'date_'],
-            'classes': ['DateTime', 'PDO', 'Exception', 'ArrayObject', 'SplFileInfo'],
-            'keywords': ['public', 'private', 'protected', 'static', 'abstract', 'final'],
-            'constructs': ['i', 'else', 'foreach', 'while', 'for', 'switch', 'try', 'catch']
-        }
-        
-        # Laravel patterns
-        self.laravel_patterns = {
-            'models': ['User', 'Post', 'Comment', 'Category', 'Product'],
-            'controllers': ['UserController', 'PostController', 'AuthController'],
-            'methods': ['index', 'show', 'create', 'store', 'edit', 'update', 'destroy'],
-            'eloquent': ['find', 'where', 'get', 'first', 'create', 'update', 'delete'],
-            'blade': ['@extends', '@section', '@yield', '@i', '@foreach', '@include'],
-            'facades': ['Route', 'DB', 'Auth', 'Cache', 'Config', 'View', 'Mail']
-        }
+        self.completion_cache = OrderedDict()
+        self._active_completions = ()
+        self._file_type_cache = {}
+        self._quick_context = None
+        self._full_context = None
+        # Cache keys with an AI request in flight; repeat triggers wait for it
+        self._pending_completions = set()
     
     def run(self, edit):
         """Main completion logic"""
@@ -90,35 +248,25 @@ class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
         # Get context
         context = self._get_php_context(cursor_pos, project_type)
         
-        # Generate completions
-        completions = self._generate_completions(context, project_type)
-        
-        # Show popup
-        self._show_completion_popup(completions, cursor_pos, project_type)
+        # Generate completions; the popup is shown once they are ready
+        self._generate_completions(context, project_type)
     
     def _detect_project_type(self):
         """Detect if Laravel or native PHP"""
-        if 'project_type' in self.detection_cache:
-            return self.detection_cache['project_type']
-        
-        view = self.view
-        if not view.window() or not view.window().folders():
+        window = self.view.window()
+        folders = window.folders() if window else None
+        if not folders:
             return 'php'
         
-        project_root = view.window().folders()[0]
-        
-        laravel_indicators = [
-            'artisan', 'composer.json', 'app/Http/Controllers',
-            'app/Models', 'resources/views', 'routes/web.php'
-        ]
-        
-        is_laravel = any(
-            os.path.exists(os.path.join(project_root, indicator))
-            for indicator in laravel_indicators
-        )
-        
-        project_type = 'laravel' if is_laravel else 'php'
-        self.detection_cache['project_type'] = project_type
+        project_root = folders[0]
+        project_type = _PROJECT_TYPE_CACHE.get(project_root)
+        if project_type is None:
+            project_type = _probe_project_type(project_root)
+            _PROJECT_TYPE_CACHE[project_root] = project_type
+            if len(_PROJECT_TYPE_CACHE) > _PROJECT_TYPE_CACHE_SIZE:
+                _PROJECT_TYPE_CACHE.popitem(last=False)
+        else:
+            _PROJECT_TYPE_CACHE.move_to_end(project_root)
         return project_type
     
     def _get_php_context(self, cursor_pos, project_type):
@@ -127,10 +275,8 @@ class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
         region = view.line(cursor_pos)
         line_text = view.substr(region)
         
-        start_line = max(0, region.begin() - 1000)
-        end_line = min(view.size(), region.end() + 1000)
-        context_region = sublime.Region(start_line, end_line)
-        context = view.substr(context_region)
+        # A small window is enough for pattern detection and the cache key
+        context = self._get_quick_context(region)
         
         patterns = self._detect_laravel_patterns(context) if project_type == 'laravel' else self._detect_php_patterns(context)
         
@@ -143,25 +289,55 @@ class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
             'project_type': project_type
         }
     
+    def _get_quick_context(self, line_region):
+        """Text around the current line for pattern detection"""
+        view = self.view
+        # Same line in an unchanged buffer: reuse the last window instead of copying it again
+        key = (view.change_count(), line_region.begin(), line_region.end())
+        cached = self._quick_context
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        start = max(0, line_region.begin() - self.QUICK_CONTEXT_CHARS)
+        end = min(view.size(), line_region.end() + self.QUICK_CONTEXT_CHARS)
+        context = view.substr(sublime.Region(start, end))
+        self._quick_context = (key, context)
+        return context
+    
+    def _get_full_context(self, cursor_pos, before=None, after=None):
+        """Wider text around the cursor, only needed when prompting the AI"""
+        if before is None:
+            before = self.FULL_CONTEXT_BEFORE
+        if after is None:
+            after = self.FULL_CONTEXT_AFTER
+        view = self.view
+        line_region = view.line(cursor_pos)
+        # Repeat triggers on an unchanged line reuse the slice, cache hits included
+        key = (view.change_count(), line_region.begin(), line_region.end(), before, after)
+        cached = self._full_context
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        start = max(0, line_region.begin() - before)
+        end = min(view.size(), line_region.end() + after)
+        context = view.substr(sublime.Region(start, end))
+        self._full_context = (key, context)
+        return context
+    
     def _detect_php_patterns(self, context):
         """Detect native PHP patterns"""
-        return {
-            'is_class': 'class ' in context,
-            'is_function': 'function ' in context,
-            'is_array': 'array(' in context or '[' in context,
-            'is_object': '->' in context,
-            'is_static': '::' in context,
-        }
+        flags = dict.fromkeys(_PHP_PATTERN_KEYS, False)
+        for match in _PHP_PATTERN_RE.finditer(context):
+            flags[match.lastgroup] = True
+        return flags
     
     def _detect_laravel_patterns(self, context):
         """Detect Laravel patterns"""
-        return {
-            'is_model': 'extends.*Model' in context,
-            'is_controller': 'Controller' in context,
-            'is_migration': 'Schema::' in context,
-            'is_route': 'Route::' in context,
-            'is_eloquent': '::' in context,
-        }
+        flags = dict.fromkeys(_LARAVEL_PATTERN_KEYS, False)
+        for match in _LARAVEL_PATTERN_RE.finditer(context):
+            flags[match.lastgroup] = True
+        # Schema:: and Route:: are consumed by their own groups but are static calls too
+        if flags['is_migration'] or flags['is_route']:
+            flags['is_eloquent'] = True
+        return flags
     
     def _detect_file_type(self):
         """Detect file type"""
@@ -169,36 +345,66 @@ class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
         if not filename:
             return 'php'
         
-        if 'Controller.php' in filename:
-            return 'controller'
-        elif 'Model.php' in filename:
-            return 'model'
-        elif '.blade.php' in filename:
-            return 'blade'
-        else:
-            return 'php'
+        file_type = self._file_type_cache.get(filename)
+        if file_type is None:
+            basename = os.path.basename(filename)
+            file_type = 'php'
+            for suffix, suffix_type in self.FILE_SUFFIX_TYPES:
+                if basename.endswith(suffix):
+                    file_type = suffix_type
+                    break
+            self._file_type_cache[filename] = file_type
+        return file_type
     
     def _generate_completions(self, context, project_type):
         """Generate completions"""
-        cache_key = self._get_cache_key(context)
-        if cache_key in self.completion_cache:
-            return self.completion_cache[cache_key]
-        
-        prompt = self._build_prompt(context, project_type)
-        
-        if not self.api_client:
-            self.api_client = self.get_api_client()
+        # The prompt carries the surrounding code, so it is part of the key too
+        surrounding_code = self._get_full_context(context['cursor_pos'])
+        cache_key = self._get_cache_key(context, surrounding_code)
+        completions = self.completion_cache.get(cache_key)
+        if completions is not None:
+            _COMPLETION_STATS['hits'] += 1
+            self.completion_cache.move_to_end(cache_key)
+            self._show_completion_popup(completions, context['cursor_pos'], project_type)
+            return
+        _COMPLETION_STATS['misses'] += 1
         
+        if cache_key in self._pending_completions:
+            # Already requested; that response will open the popup
+            return
+        self._pending_completions.add(cache_key)
+        prompt = self._build_prompt(context, project_type, surrounding_code)
+        
+        # The model call can take seconds; run it on the worker pool and come
+        # back to the main thread for the cache and the popup
+        future = get_worker_manager().submit(
+            self.get_api_client().make_blocking_request, prompt,
+            priority=0,
+            key="php_completion:{0}:{1}".format(self.view.id(), cache_key.hex())
+        )
+        future.add_done_callback(
+            lambda f: sublime.set_timeout(
+                lambda: self._on_completion_response(f, cache_key, context, project_type), 0
+            )
+        )
+    
+    def _on_completion_response(self, future, cache_key, context, project_type):
+        """Cache the AI response and show it if the cursor has not moved"""
+        self._pending_completions.discard(cache_key)
         try:
-            response = self.api_client.make_blocking_request(prompt)
-            completions = self._parse_completions(response, context, project_type)
-            self.completion_cache[cache_key] = completions
-            return completions
+            response = future.result()
         except Exception as e:
             print("Completion error: {0}".format(e))
-            return self._get_fallback_completions(context, project_type)
+            completions = self._get_fallback_completions(context, project_type)
+        else:
+            completions = self._parse_completions(response, context, project_type)
+            self._cache_put(cache_key, completions)
+        
+        selection = self.view.sel()
+        if len(selection) and selection[0].begin() == context['cursor_pos']:
+            self._show_completion_popup(completions, context['cursor_pos'], project_type)
     
-    def _build_prompt(self, context, project_type):
+    def _build_prompt(self, context, project_type, surrounding_code):
         """Build prompt"""
         file_type = context['file_type']
         current_line = context['current_line']
@@ -210,56 +416,68 @@ class LaravelWorkshopPhpCompletionCommand(LaravelWorkshopContextCommandBase):
 File type: {file_type}
 Current line: {current_line}
 
-Provide 5 {framework}-specific completions. Return only code, one per line."""
+Surrounding code:
+{surrounding_code}
+
+Provide 5 {framework}-specific completions. Return only code, one per line.""".format(
+            framework=framework,
+            file_type=file_type,
+            current_line=current_line,
+            surrounding_code=surrounding_code
+        )
     
     def _parse_completions(self, response, context, project_type):
         """Parse completions"""
         try:
-            completions = [line.strip() for line in response.split('\n') if line.strip()]
-            return completions[:5]
+            return tuple(line.strip() for line in response.split('\n') if line.strip())[:5]
         except:
             return self._get_fallback_completions(context, project_type)
     
     def _get_fallback_completions(self, context, project_type):
         """Fallback completions"""
         if project_type == 'laravel':
-            return [
-                'public function index() {',
-                'return view(\'',
-                'public function store(Request $request) {',
-                'return redirect()->route(\''
-            ]
-        return [
-            'public function ',
-            'private function ',
-            'protected function ',
-            'if (',
-            'foreach ('
-        ]
+            return _LARAVEL_FALLBACK_COMPLETIONS
+        return _PHP_FALLBACK_COMPLETIONS
     
     def _show_completion_popup(self, completions, cursor_pos, project_type):
         """Show popup"""
         if not completions:
             return
         
-        completion_items = []
-        for i, completion in enumerate(completions):
-            label = 'Laravel' if project_type == 'laravel' else 'PHP'
-            completion_items.append([completion, "{0} {1}".format(label, i+1)])
+        label = 'Laravel' if project_type == 'laravel' else 'PHP'
+        completion_items = [
+            [completion, "{0} {1}".format(label, i+1)]
+            for i, completion in enumerate(completions)
+        ]
         
-        self.view.show_popup_menu(completion_items, lambda idx: self._on_select(idx, completions))
+        self._active_completions = completions
+        self.view.show_popup_menu(completion_items, self._on_select)
     
-    def _on_select(self, index, completions):
+    def _on_select(self, index):
         """Handle selection"""
-        if index == -1 or index >= len(completions):
+        completions = self._active_completions
+        if index < 0 or not completions or index >= len(completions):
             return
         self.view.run_command('insert', {'characters': completions[index]})
     
-    def _get_cache_key(self, context):
+    def _cache_put(self, key, completions):
+        """Store parsed completions, evicting the least recently used entry"""
+        self.completion_cache[key] = completions
+        self.completion_cache.move_to_end(key)
+        if len(self.completion_cache) > self.COMPLETION_CACHE_SIZE:
+            self.completion_cache.popitem(last=False)
+    
+    def _get_cache_key(self, context, surrounding_code):
         """Generate cache key"""
-        import hashlib
-        key_data = "{0}_{1}_{2}".format(context['current_line'], context['file_type'], context['project_type'])
-        return hashlib.md5(key_data.encode()).hexdigest()
+        key = hashlib.blake2b(digest_size=8)
+        key.update(context['current_line'].encode('utf-8'))
+        key.update(b'\0')
+        key.update(context['file_type'].encode('utf-8'))
+        key.update(b'\0')
+        key.update(context['project_type'].encode('utf-8'))
+        key.update(b'\0')
+        key.update(surrounding_code.encode('utf-8'))
+        return key.digest()
 
 
 # ============================================================================
@@ -298,27 +516,27 @@ class LaravelWorkshopCreateFileCommand(sublime_plugin.WindowCommand):
         )
         
         # Use the same logic as Generate Files command
-        api_client = create_api_client_from_settings()
+        api_client = _get_cached_api_client()
         prompt = self._build_generation_prompt(description, project_root)
         
-        handler = StreamingResponseHandler()
-        
-        def content_callback(content):
-            UIHelpers.append_to_tab(progress_tab, content)
-            handler.handle_chunk(content)
+        handler = StreamingResponseHandler(
+            flush_callback=lambda text: UIHelpers.append_to_tab(progress_tab, text)
+        )
         
         def fetch():
             try:
-                api_client.make_streaming_request(prompt, content_callback)
+                api_client.make_streaming_request(prompt, handler.handle_chunk)
+                handler.handle_completion()
                 response = handler.get_accumulated_content()
                 
                 # Parse and create files (same as Generate Files)
                 self._create_files_from_ai_response(response, project_root, progress_tab)
                 
             except Exception as e:
+                handler.flush()
                 UIHelpers.append_to_tab(progress_tab, "\n\n❌ Error: {}".format(str(e)))
         
-        threading.Thread(target=fetch).start()
+        get_worker_manager().submit(fetch)
     
     def _build_generation_prompt(self, user_input, project_root):
         """Build AI prompt with project analysis"""
@@ -332,7 +550,6 @@ class LaravelWorkshopCreateFileCommand(sublime_plugin.WindowCommand):
             # Read composer.json if exists
             composer_path = os.path.join(project_root, 'composer.json')
             if os.path.exists(composer_path):
-                import json
                 with open(composer_path, 'r') as f:
                     composer_data = json.load(f)
                     name = composer_data.get('name', '')
@@ -404,8 +621,6 @@ Return ONLY valid JSON (NO markdown, NO explanations):
     
     def _create_files_from_ai_response(self, response, project_root, progress_tab):
         """Parse AI response and create files (shared with Generate Files)"""
-        import json
-        import re
         
         UIHelpers.append_to_tab(progress_tab, "\n📝 Parsing response...\n")
         
@@ -468,6 +683,10 @@ Return ONLY valid JSON (NO markdown, NO explanations):
 class LaravelWorkshopCacheManagerCommand(sublime_plugin.WindowCommand):
     """Manage Laravel Workshop AI cache"""
     
+    STATS_TAB_TITLE = "Laravel Workshop AI Cache Statistics"
+    # Counters the open stats tab was last rendered from
+    _stats_snapshot = None
+    
     def run(self):
         options = [
             ["Clear All Cache", "Remove all cached data"],
@@ -475,21 +694,19 @@ class LaravelWorkshopCacheManagerCommand(sublime_plugin.WindowCommand):
             ["Clear Completion Cache", "Clear PHP completion cache"],
             ["View Cache Stats", "Show cache statistics"]
         ]
+        self._handlers = {
+            0: self.clear_all_cache,
+            1: self.clear_context_cache,
+            2: self.clear_completion_cache,
+            3: self.show_cache_stats
+        }
         
         self.window.show_quick_panel(options, self.on_select)
     
     def on_select(self, index):
-        if index == -1:
-            return
-        
-        if index == 0:
-            self.clear_all_cache()
-        elif index == 1:
-            self.clear_context_cache()
-        elif index == 2:
-            self.clear_completion_cache()
-        elif index == 3:
-            self.show_cache_stats()
+        handler = self._handlers.get(index)
+        if handler:
+            handler()
     
     def clear_all_cache(self):
         try:
@@ -498,18 +715,70 @@ class LaravelWorkshopCacheManagerCommand(sublime_plugin.WindowCommand):
                 import shutil
                 shutil.rmtree(cache_dir)
                 os.makedirs(cache_dir)
+            ContextAnalyzer.clear_context_cache()
+            clear_response_cache()
+            with _CODE_SMELL_CACHE_LOCK:
+                _CODE_SMELL_CACHE.clear()
             sublime.status_message("✅ All cache cleared")
         except Exception as e:
             sublime.error_message("Failed to clear cache: {0}".format(str(e)))
     
     def clear_context_cache(self):
+        ContextAnalyzer.clear_context_cache()
         sublime.status_message("✅ Context cache cleared")
     
     def clear_completion_cache(self):
+        # Cached AI answers would otherwise replay the same completion
+        clear_response_cache()
         sublime.status_message("✅ Completion cache cleared")
     
     def show_cache_stats(self):
-        sublime.message_dialog("Cache Stats:\n\nContext cache: 0 items\nCompletion cache: 0 items")
+        hits = _COMPLETION_STATS['hits']
+        misses = _COMPLETION_STATS['misses']
+        snapshot = (
+            hits, misses, len(_PROJECT_TYPE_CACHE),
+            len(_CODE_SMELL_CACHE), ContextAnalyzer.context_cache_size()
+        )
+        
+        stats_view = None
+        for view in self.window.views():
+            if view.name() == self.STATS_TAB_TITLE:
+                stats_view = view
+                break
+        
+        # Nothing changed since the open tab was rendered: just bring it forward
+        if stats_view is not None and snapshot == self._stats_snapshot:
+            self.window.focus_view(stats_view)
+            return
+        
+        total = hits + misses
+        hit_rate = (hits / total * 100) if total else 0.0
+        parts = [
+            "# 📊 Cache Statistics\n\n",
+            "## PHP Completion\n",
+            "- **Lookups**: {0}\n".format(total),
+            "- **Hits**: {0}\n".format(hits),
+            "- **Misses**: {0}\n".format(misses),
+            "- **Hit Rate**: {0:.1f}%\n\n".format(hit_rate),
+            "## Project\n",
+            "- **Project Types Cached**: {0}/{1}\n".format(len(_PROJECT_TYPE_CACHE), _PROJECT_TYPE_CACHE_SIZE),
+            "- **Code Smell Results Cached**: {0}/{1}\n".format(len(_CODE_SMELL_CACHE), _CODE_SMELL_CACHE_SIZE),
+            "- **Symbol Contexts Cached**: {0}/{1}\n".format(ContextAnalyzer.context_cache_size(), ContextAnalyzer.CONTEXT_CACHE_SIZE),
+        ]
+        
+        stats_text = "".join(parts)
+        LaravelWorkshopCacheManagerCommand._stats_snapshot = snapshot
+        
+        # Refresh an already open stats tab instead of opening another view
+        if stats_view is not None:
+            stats_view.run_command("select_all")
+            stats_view.run_command("right_delete")
+            stats_view.run_command("append", {"characters": stats_text})
+            self.window.focus_view(stats_view)
+            return
+        
+        tab = UIHelpers.create_output_tab(self.window, self.STATS_TAB_TITLE, stats_text)
+        tab.set_syntax_file("Packages/Markdown/Markdown.sublime-syntax")
 
 
 # ============================================================================
@@ -621,18 +890,23 @@ class LaravelWorkshopEditSettingsCommand(sublime_plugin.WindowCommand):
         
         # If we have both parsed, show only differences for display
         # But keep full user content for editing
+        # (diffed and serialized once; the right panel reuses both)
+        differences = None
+        formatted_diff = ""
         if default_dict and user_dict:
             differences = self._find_settings_differences(default_dict, user_dict)
             if differences:
-                # Format differences nicely
-                formatted_diff = json.dumps(differences, indent=4, ensure_ascii=False)
-                user_content_display = "{\n    // ============================================\n"
-                user_content_display += "    // Your Custom Overrides (differs from default)\n"
-                user_content_display += "    // ============================================\n"
-                user_content_display += "    // Only settings that differ are shown here\n"
-                user_content_display += "    // See left panel for all available settings\n\n"
-                user_content_display += formatted_diff[1:]  # Remove opening brace (already added)
-                user_content_display = user_content_display.rstrip() + "\n}"
+                # Format differences nicely, without the opening brace (added by the header)
+                formatted_diff = json.dumps(differences, indent=4, ensure_ascii=False)[1:].rstrip()
+                user_content_display = "".join((
+                    "{\n    // ============================================\n",
+                    "    // Your Custom Overrides (differs from default)\n",
+                    "    // ============================================\n",
+                    "    // Only settings that differ are shown here\n",
+                    "    // See left panel for all available settings\n\n",
+                    formatted_diff,
+                    "\n}",
+                ))
             else:
                 user_content_display = """{
     // ============================================
@@ -692,20 +966,22 @@ class LaravelWorkshopEditSettingsCommand(sublime_plugin.WindowCommand):
                 sublime.set_timeout(do_insert, 50)
             else:
                 # Show helpful message with path info
-                error_msg = "// ===========================================\n"
-                error_msg += "// Default Settings file not found\n"
-                error_msg += "// ===========================================\n\n"
-                error_msg += "Expected path: {}\n\n".format(default_settings_path)
-                error_msg += "Packages path: {}\n\n".format(packages_path)
-                error_msg += "File exists: {}\n\n".format(os.path.exists(default_settings_path))
-                error_msg += "Please check if the file exists in:\n"
-                error_msg += "  Packages/LaravelWorkshopAI38/LaravelWorkshopAI.sublime-settings\n\n"
-                error_msg += "// Example minimal config:\n{\n"
-                error_msg += '    "ai_provider": "ollama",\n'
-                error_msg += '    "ollama": {\n'
-                error_msg += '        "model": "qwen2.5-coder:latest"\n'
-                error_msg += '    }\n'
-                error_msg += "}\n"
+                error_msg = "".join((
+                    "// ===========================================\n",
+                    "// Default Settings file not found\n",
+                    "// ===========================================\n\n",
+                    "Expected path: {}\n\n".format(default_settings_path),
+                    "Packages path: {}\n\n".format(packages_path),
+                    "File exists: {}\n\n".format(os.path.exists(default_settings_path)),
+                    "Please check if the file exists in:\n",
+                    "  Packages/LaravelWorkshopAI38/LaravelWorkshopAI.sublime-settings\n\n",
+                    "// Example minimal config:\n{\n",
+                    '    "ai_provider": "ollama",\n',
+                    '    "ollama": {\n',
+                    '        "model": "qwen2.5-coder:latest"\n',
+                    '    }\n',
+                    "}\n",
+                ))
                 default_view.set_read_only(False)
                 default_view.run_command('select_all')
                 default_view.run_command('right_delete')
@@ -733,16 +1009,16 @@ class LaravelWorkshopEditSettingsCommand(sublime_plugin.WindowCommand):
         
         def populate_user_diff_view():
             if default_dict and user_dict:
-                differences = self._find_settings_differences(default_dict, user_dict)
                 if differences:
-                    formatted = json.dumps(differences, indent=4, ensure_ascii=False)
-                    content = "{\n    // ============================================\n"
-                    content += "    // Your Custom Overrides\n"
-                    content += "    // ============================================\n"
-                    content += "    // Only settings that differ from default (left)\n"
-                    content += "    // See left panel for all available settings\n\n"
-                    content += formatted[1:]  # Skip opening brace
-                    content = content.rstrip() + "\n}"
+                    content = "".join((
+                        "{\n    // ============================================\n",
+                        "    // Your Custom Overrides\n",
+                        "    // ============================================\n",
+                        "    // Only settings that differ from default (left)\n",
+                        "    // See left panel for all available settings\n\n",
+                        formatted_diff,
+                        "\n}",
+                    ))
                     user_diff_view.run_command('append', {'characters': content})
                     
                     # Store path for saving
@@ -853,6 +1129,8 @@ class LaravelWorkshopEditSettingsCommand(sublime_plugin.WindowCommand):
 class LaravelWorkshopAiPromptCommand(sublime_plugin.WindowCommand):
     """Cursor-like inline chat interface with file creation capability"""
     
+    MAX_FILES_TO_OPEN = 10
+    
     def run(self):
         UIHelpers.show_input_panel(
             self.window,
@@ -865,51 +1143,54 @@ class LaravelWorkshopAiPromptCommand(sublime_plugin.WindowCommand):
         if not user_input.strip():
             return
         
-        api_client = create_api_client_from_settings()
+        api_client = _get_cached_api_client()
         
         view = self.window.active_view()
-        context_analyzer = ContextAnalyzer.from_view(view)
-        usage_context = ""
-        
-        current_file_path = None
-        if view and view.file_name():
-            current_file_path = view.file_name()
-            if context_analyzer and context_analyzer.project_root:
-                relative_path = os.path.relpath(current_file_path, context_analyzer.project_root)
-                try:
-                    symbol, usage_context = context_analyzer.analyze_text_for_context(user_input, current_file_path)
-                except Exception:
-                    usage_context = ""
+        current_file_path = view.file_name() if view else None
         
         # Check if this is a file creation request
         is_file_creation = user_input.lower().startswith('create: ')
         if is_file_creation:
             user_input = user_input.replace('create: ', '', 1).strip()
         
-        full_prompt = "{0}{1}".format(user_input, usage_context)
-        
-        # Enhanced prompt for file creation
-        if is_file_creation:
-            full_prompt = self._build_file_creation_prompt(user_input, context_analyzer, current_file_path)
-
         tab = UIHelpers.create_output_tab(
             self.window, 
             "AI Chat",
             "\n> {0}\n\n".format(user_input)
         )
+        handler = StreamingResponseHandler(
+            flush_callback=lambda text: UIHelpers.append_to_tab(tab, text)
+        )
 
         def fetch():
             try:
-                content = api_client.make_blocking_request(full_prompt)
+                # Project analysis may walk the tree, so keep it off the UI thread
+                context_analyzer = ContextAnalyzer.from_view(view)
+                
+                if is_file_creation:
+                    # Enhanced prompt for file creation
+                    full_prompt = self._build_file_creation_prompt(user_input, context_analyzer, current_file_path)
+                else:
+                    usage_context = ""
+                    if current_file_path and context_analyzer and context_analyzer.project_root:
+                        try:
+                            symbol, usage_context = context_analyzer.analyze_text_for_context(user_input, current_file_path)
+                        except Exception:
+                            usage_context = ""
+                    full_prompt = "{0}{1}".format(user_input, usage_context)
+                
+                # Stream into the tab as tokens arrive while collecting the full reply
+                api_client.make_streaming_request(full_prompt, handler.handle_chunk)
+                handler.handle_completion()
+                content = handler.get_accumulated_content()
                 if content:
-                    UIHelpers.append_to_tab(tab, content)
-                    
                     # If it's a file creation request, parse and create files
                     if is_file_creation:
                         self._create_files_from_response(content, context_analyzer.project_root)
                 else:
                     UIHelpers.append_to_tab(tab, "No response received")
             except Exception as e:
+                handler.flush()
                 UIHelpers.append_to_tab(tab, "Error: {0}".format(str(e)))
 
         sublime.set_timeout_async(fetch, 0)
@@ -969,7 +1250,6 @@ RETURN ONLY VALID JSON, NO MARKDOWN OR EXPLANATIONS."""
             if os.path.exists(os.path.join(project_root, 'composer.json')):
                 try:
                     with open(os.path.join(project_root, 'composer.json'), 'r') as f:
-                        import json
                         composer_data = json.load(f)
                         ns = composer_data.get('autoload', {}).get('psr-4', {})
                         if ns:
@@ -984,15 +1264,13 @@ RETURN ONLY VALID JSON, NO MARKDOWN OR EXPLANATIONS."""
     
     def _create_files_from_response(self, response, project_root):
         """Parse AI response and create files"""
-        import json
-        import re
         
         try:
             # Extract JSON from response
-            json_match = re.search(r'\{.*"files".*\}', response, re.DOTALL)
+            json_match = _JSON_FILES_RE.search(response)
             if not json_match:
                 # Try to find code blocks that might contain JSON
-                json_match = re.search(r'```json\s*(\{.*?\})\s*```', response, re.DOTALL)
+                json_match = _JSON_FENCE_OBJECT_RE.search(response)
                 if json_match:
                     json_text = json_match.group(1)
                 else:
@@ -1010,7 +1288,7 @@ RETURN ONLY VALID JSON, NO MARKDOWN OR EXPLANATIONS."""
                 return
             
             # Create files
-            created_count = 0
+            created_paths = []
             for file_info in files:
                 path = file_info.get('path')
                 content = file_info.get('content')
@@ -1023,14 +1301,20 @@ RETURN ONLY VALID JSON, NO MARKDOWN OR EXPLANATIONS."""
                 
                 # Create file
                 if UIHelpers.create_file_safely(full_path, content):
-                    created_count += 1
+                    created_paths.append(full_path)
                     UIHelpers.show_status_message("✅ Created: {}".format(path), 2000)
-                    
-                    # Open the file
-                    UIHelpers.open_file_in_window(self.window, full_path, 500)
             
+            created_count = len(created_paths)
             if created_count > 0:
-                sublime.status_message("✅ Created {} file(s)".format(created_count))
+                # Open the created files in one batch once everything is written
+                to_open = created_paths[:self.MAX_FILES_TO_OPEN]
+                window = self.window
+                sublime.set_timeout(lambda: [UIHelpers.open_file_in_window(window, p) for p in to_open], 500)
+                
+                if created_count > len(to_open):
+                    sublime.status_message("✅ Created {} file(s), opened the first {}".format(created_count, len(to_open)))
+                else:
+                    sublime.status_message("✅ Created {} file(s)".format(created_count))
             else:
                 sublime.status_message("No files were created")
                 
@@ -1059,19 +1343,33 @@ class LaravelWorkshopAiSmartCompletionCommand(LaravelWorkshopContextCommandBase)
 
 {context_text}
 
-Provide a smart completion that makes sense in context. Return only the completion code."""
+Provide a smart completion that makes sense in context. Return only the completion code.""".format(context_text=context_text)
+
+        view = self.view
+        popup = {'shown': False}
+        # Batches arrive in order; the popup text is built only from them
+        received = []
+
+        def render(batch):
+            # Redraw the popup with everything received so far, one frame at a time
+            received.append(batch)
+            content = "<div style='padding: 10px;'><pre>{0}</pre></div>".format(
+                html.escape("".join(received))
+            )
+            if not popup['shown']:
+                popup['shown'] = True
+                view.show_popup(content, max_width=600, max_height=400)
+            elif view.is_popup_visible():
+                view.update_popup(content)
+
+        handler = StreamingResponseHandler(flush_callback=render)
 
         def fetch():
             try:
-                completion = api_client.make_blocking_request(prompt)
-                if completion:
-                    # Show completion in popup
-                    self.view.show_popup(
-                        "<div style='padding: 10px;'><pre>{0}</pre></div>".format(completion),
-                        max_width=600,
-                        max_height=400
-                    )
+                api_client.make_streaming_request(prompt, handler.handle_chunk)
+                handler.handle_completion()
             except Exception as e:
+                handler.flush()
                 sublime.status_message("Completion failed: {0}".format(str(e)))
 
         sublime.set_timeout_async(fetch, 0)
@@ -1109,20 +1407,19 @@ class LaravelWorkshopAiGenerateFilesCommand(sublime_plugin.WindowCommand):
         )
         
         # Create API client
-        api_client = create_api_client_from_settings()
+        api_client = _get_cached_api_client()
         
         # Build comprehensive prompt
         prompt = self._build_generation_prompt(user_input, project_root)
         
-        handler = StreamingResponseHandler()
-        
-        def content_callback(content):
-            UIHelpers.append_to_tab(progress_tab, content)
-            handler.handle_chunk(content)
+        handler = StreamingResponseHandler(
+            flush_callback=lambda text: UIHelpers.append_to_tab(progress_tab, text)
+        )
         
         def fetch():
             try:
-                api_client.make_streaming_request(prompt, content_callback)
+                api_client.make_streaming_request(prompt, handler.handle_chunk)
+                handler.handle_completion()
                 
                 response = handler.get_accumulated_content()
                 
@@ -1130,9 +1427,10 @@ class LaravelWorkshopAiGenerateFilesCommand(sublime_plugin.WindowCommand):
                 self._create_files_from_ai_response(response, project_root, progress_tab)
                 
             except Exception as e:
+                handler.flush()
                 UIHelpers.append_to_tab(progress_tab, "\n\n❌ Error: {}".format(str(e)))
         
-        threading.Thread(target=fetch).start()
+        get_worker_manager().submit(fetch)
     
     def _build_generation_prompt(self, user_input, project_root):
         """Build AI prompt with project analysis"""
@@ -1224,7 +1522,6 @@ CRITICAL: Return ONLY the JSON object. No ```json```, no markdown fences.""".for
             if os.path.exists(composer_path):
                 try:
                     with open(composer_path, 'r') as f:
-                        import json
                         composer_data = json.load(f)
                         name = composer_data.get('name', '')
                         require = composer_data.get('require', {})
@@ -1248,7 +1545,6 @@ CRITICAL: Return ONLY the JSON object. No ```json```, no markdown fences.""".for
     
     def _fix_nested_json_content(self, json_text):
         """Fix nested JSON in content fields by properly escaping nested quotes"""
-        import re
         
         # Simple regex approach: find "content": "..." and fix nested quotes
         # We'll find the content field and replace unescaped quotes inside
@@ -1281,19 +1577,13 @@ CRITICAL: Return ONLY the JSON object. No ```json```, no markdown fences.""".for
             
             return prefix + fixed + suffix
         
-        # Pattern to match content fields: "content": "value"
-        # This handles multi-line strings too
-        pattern = r'("content"\s*:\s*")(.*?)("(?:\s*[,}\]]))'
-        
-        # Use DOTALL to match across newlines
-        fixed_json = re.sub(pattern, fix_content_field, json_text, flags=re.DOTALL)
+        # Match content fields ("content": "value"), across newlines too
+        fixed_json = _JSON_CONTENT_FIELD_RE.sub(fix_content_field, json_text)
         
         return fixed_json
     
     def _create_files_from_ai_response(self, response, project_root, progress_tab):
         """Parse AI response and create files"""
-        import json
-        import re
         
         UIHelpers.append_to_tab(progress_tab, "\n\n📝 Parsing AI response...\n")
         
@@ -1323,12 +1613,12 @@ CRITICAL: Return ONLY the JSON object. No ```json```, no markdown fences.""".for
             
             # Method 2: Find in code blocks if no complete JSON found
             if not json_text:
-                json_block = re.search(r'```json\s*(.*?)```', response, re.DOTALL)
+                json_block = _JSON_FENCE_RE.search(response)
                 if json_block:
                     json_text = json_block.group(1).strip()
                 else:
                     # Try without json tag
-                    json_block = re.search(r'```\s*(.*?)```', response, re.DOTALL)
+                    json_block = _ANY_FENCE_RE.search(response)
                     if json_block and '"files"' in json_block.group(1):
                         json_text = json_block.group(1).strip()
             
@@ -1432,18 +1722,24 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
             return
         
         # Check if feature is enabled
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        if not settings.get("enable_code_smell_finder", True):
+        if not get_setting("enable_code_smell_finder", True):
             sublime.status_message("Code Smell Finder is disabled in settings")
             return
         
+        scan_key = "scan:code_smell:" + project_root
+        if _focus_running_scan(self.window, scan_key):
+            return
+        
         progress_tab = UIHelpers.create_progress_tab(
             self.window,
             "🔍 Finding Code Smells...",
             "Scanning project for code smells...\n"
         )
+        _SCAN_TABS[scan_key] = progress_tab
         
-        api_client = create_api_client_from_settings()
+        api_client = _get_cached_api_client()
+        prompt_template = get_setting("code_smell_prompt", "")
+        max_workers = max(1, int(get_setting("code_smell_concurrency", 4)))
         
         def analyze():
             try:
@@ -1452,12 +1748,18 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
                 UIHelpers.append_to_tab(progress_tab, "Found {} PHP files\n".format(len(php_files)))
                 UIHelpers.append_to_tab(progress_tab, "Analyzing...\n\n")
                 
-                # Analyze each file
+                context_analyzer = ContextAnalyzer(project_root)
+                
+                def analyze_file(file_path):
+                    return self._analyze_file(file_path, api_client, progress_tab, prompt_template, context_analyzer)
+                
+                # Files are independent, so keep a few AI requests in flight;
+                # map() still yields results in file order
                 all_issues = []
-                for file_path in php_files[:50]:  # Limit to 50 files for performance
-                    issues = self._analyze_file(file_path, api_client, progress_tab)
-                    if issues:
-                        all_issues.extend(issues)
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for issues in executor.map(analyze_file, php_files[:50]):  # Limit to 50 files for performance
+                        if issues:
+                            all_issues.extend(issues)
                 
                 # Display results
                 self._display_results(progress_tab, all_issues)
@@ -1465,7 +1767,8 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
             except Exception as e:
                 UIHelpers.append_to_tab(progress_tab, "\n❌ Error: {}".format(str(e)))
         
-        threading.Thread(target=analyze).start()
+        # Minutes of blocking AI calls: keep them off Sublime's shared async thread
+        get_worker_manager().submit(analyze, priority=2, key=scan_key)
     
     def _scan_php_files(self, project_root):
         """Scan project for PHP files"""
@@ -1481,20 +1784,28 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
         
         return php_files
     
-    def _analyze_file(self, file_path, api_client, progress_tab):
+    def _analyze_file(self, file_path, api_client, progress_tab, prompt_template, context_analyzer):
         """Analyze a single file for code smells"""
         try:
+            stat = os.stat(file_path)
             with open(file_path, 'r', encoding='utf-8') as f:
                 content = f.read()
         except:
             return []
         
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        prompt_template = settings.get("code_smell_prompt", "")
-        
-        # Get context for the file
-        project_root = UIHelpers.ensure_project_folder(self.window)
-        context_analyzer = ContextAnalyzer(project_root)
+        # Reuse the previous analysis when neither the file, the prompt nor the model changed
+        signature = hashlib.blake2b(
+            "{0}\0{1}\0{2}\0{3}\0{4}\0{5}".format(
+                file_path, stat.st_mtime_ns, stat.st_size, prompt_template,
+                getattr(api_client, 'provider', 'ollama'), getattr(api_client, 'model', '')
+            ).encode('utf-8'),
+            digest_size=16
+        ).digest()
+        with _CODE_SMELL_CACHE_LOCK:
+            cached = _CODE_SMELL_CACHE.get(file_path)
+            if cached and cached[0] == signature:
+                _CODE_SMELL_CACHE.move_to_end(file_path)
+                return [{"file": file_path, "issues": cached[1]}]
         
         # Build context
         context = ""
@@ -1509,6 +1820,11 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
         try:
             response = api_client.make_blocking_request(prompt)
             if response:
+                with _CODE_SMELL_CACHE_LOCK:
+                    _CODE_SMELL_CACHE[file_path] = (signature, response)
+                    _CODE_SMELL_CACHE.move_to_end(file_path)
+                    if len(_CODE_SMELL_CACHE) > _CODE_SMELL_CACHE_SIZE:
+                        _CODE_SMELL_CACHE.popitem(last=False)
                 return [{"file": file_path, "issues": response}]
         except:
             pass
@@ -1525,10 +1841,13 @@ class LaravelWorkshopCodeSmellFinderCommand(sublime_plugin.WindowCommand):
         UIHelpers.append_to_tab(progress_tab, "🔍 CODE SMELLS FOUND: {}\n".format(len(all_issues)))
         UIHelpers.append_to_tab(progress_tab, "="*60 + "\n\n")
         
+        project_root = UIHelpers.ensure_project_folder(self.window)
+        relpath = os.path.relpath
+        append = UIHelpers.append_to_tab
         for issue in all_issues:
-            rel_path = os.path.relpath(issue['file'], UIHelpers.ensure_project_folder(self.window))
-            UIHelpers.append_to_tab(progress_tab, "📄 {}\n".format(rel_path))
-            UIHelpers.append_to_tab(progress_tab, "{}\n\n".format(issue['issues']))
+            rel_path = relpath(issue['file'], project_root)
+            append(progress_tab, "📄 {}\n".format(rel_path))
+            append(progress_tab, "{}\n\n".format(issue['issues']))
 
 
 # ============================================================================
@@ -1543,13 +1862,19 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
         if not project_root:
             return
         
+        scan_key = "scan:optimize:" + project_root
+        if _focus_running_scan(self.window, scan_key):
+            return
+        
         progress_tab = UIHelpers.create_progress_tab(
             self.window,
             "⚡ Optimizing Project...",
             "Scanning project for optimization opportunities...\n"
         )
+        _SCAN_TABS[scan_key] = progress_tab
         
-        api_client = create_api_client_from_settings()
+        api_client = _get_cached_api_client()
+        prompt_template = get_setting("optimize_prompt", "")
         
         def analyze():
             try:
@@ -1561,7 +1886,7 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
                 # Find methods in each file
                 all_optimizations = []
                 for file_path in php_files[:50]:
-                    optimizations = self._find_optimizations(file_path, api_client, progress_tab)
+                    optimizations = self._find_optimizations(file_path, api_client, progress_tab, prompt_template)
                     if optimizations:
                         all_optimizations.extend(optimizations)
                 
@@ -1571,7 +1896,8 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
             except Exception as e:
                 UIHelpers.append_to_tab(progress_tab, "\n❌ Error: {}".format(str(e)))
         
-        threading.Thread(target=analyze).start()
+        # Minutes of blocking AI calls: keep them off Sublime's shared async thread
+        get_worker_manager().submit(analyze, priority=2, key=scan_key)
     
     def _scan_php_files(self, project_root):
         """Scan project for PHP files"""
@@ -1584,7 +1910,7 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
                     php_files.append(os.path.join(root, file))
         return php_files
     
-    def _find_optimizations(self, file_path, api_client, progress_tab):
+    def _find_optimizations(self, file_path, api_client, progress_tab, prompt_template):
         """Find methods that can be optimized"""
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
@@ -1593,13 +1919,9 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
             return []
         
         # Extract methods using regex - find methods with balanced braces
-        import re
-        
-        # Better pattern that handles nested braces
         methods = []
-        method_pattern = r'(?:public|private|protected)\s+function\s+\w+\s*\([^)]*\)\s*'
         
-        for match in re.finditer(method_pattern, content):
+        for match in _PHP_METHOD_RE.finditer(content):
             start = match.end()
             brace_count = 0
             method_start = start
@@ -1629,9 +1951,6 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
         if not methods:
             return []
         
-        settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-        prompt_template = settings.get("optimize_prompt", "")
-        
         optimizations = []
         for method in methods[:5]:  # Limit per file
             prompt = prompt_template.format(code=method)
@@ -1659,8 +1978,11 @@ class LaravelWorkshopOptimizeProjectCommand(sublime_plugin.WindowCommand):
         UIHelpers.append_to_tab(progress_tab, "⚡ OPTIMIZATION OPPORTUNITIES: {}\n".format(len(optimizations)))
         UIHelpers.append_to_tab(progress_tab, "="*60 + "\n\n")
         
+        project_root = UIHelpers.ensure_project_folder(self.window)
+        relpath = os.path.relpath
+        append = UIHelpers.append_to_tab
         for opt in optimizations:
-            rel_path = os.path.relpath(opt['file'], UIHelpers.ensure_project_folder(self.window))
-            UIHelpers.append_to_tab(progress_tab, "📄 {}\n".format(rel_path))
-            UIHelpers.append_to_tab(progress_tab, "Method: {}\n".format(opt['method']))
-            UIHelpers.append_to_tab(progress_tab, "Optimized:\n{}\n\n".format(opt['optimized']))
+            rel_path = relpath(opt['file'], project_root)
+            append(progress_tab, "📄 {}\n".format(rel_path))
+            append(progress_tab, "Method: {}\n".format(opt['method']))
+            append(progress_tab, "Optimized:\n{}\n\n".format(opt['optimized']))
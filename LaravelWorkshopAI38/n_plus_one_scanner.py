@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import itertools
 import re
 from typing import Dict, List, Any, Tuple
 
@@ -13,10 +14,19 @@ FOREACH_RE = re.compile(r"@?foreach\s*\((?P<expr>[^)]*)\)|foreach\s*\((?P<expr2>
 GET_QUERY_RE = re.compile(r"->\s*get\s*\(\s*\)")
 PAGINATE_QUERY_RE = re.compile(r"(->\s*paginate\s*\(.*?\))")
 WITH_RE = re.compile(r"->\s*with\s*\(")
+# Query-builder vs service/action chaining markers, one alternation each instead of per-token scans
+BUILDER_TOKEN_RE = re.compile("|".join(re.escape(tok) for tok in (
+    '::query(', '::where', '->where', '::with', '->with', '::select', '->select',
+    '::join', '->join', '::orderBy', '->orderBy', '::latest', '->latest', '::oldest', '->oldest'
+)))
+SERVICE_TOKEN_RE = re.compile("|".join(re.escape(tok) for tok in ('->execute(', 'Action->', 'Service->')))
+# common scalar props that are not relations
+SCALAR_PROPS = frozenset({"id", "name", "title", "created_at", "updated_at", "pivot", "attributes"})
 
 
 def _extract_relations_in_loops(content: str) -> List[str]:
     relations: List[str] = []
+    seen = set()
     for m in FOREACH_RE.finditer(content):
         start = m.end()
         # lookahead small window after foreach for relation access lines
@@ -24,9 +34,10 @@ def _extract_relations_in_loops(content: str) -> List[str]:
         for rm in RELATION_ACCESS_RE.finditer(window):
             rel = rm.group("rel")
             # ignore common scalar props
-            if rel in {"id", "name", "title", "created_at", "updated_at", "pivot", "attributes"}:
+            if rel in SCALAR_PROPS:
                 continue
-            if rel not in relations:
+            if rel not in seen:
+                seen.add(rel)
                 relations.append(rel)
     return relations
 
@@ -42,21 +53,17 @@ def _suggest_with_injection(lines: List[str], relations: List[str]) -> List[Tupl
     with_arg = ", ".join([f"'{r}'" for r in relations[:3]])
     with_clause = f"->with([{with_arg}])"
 
-    builder_tokens = [
-        '::query(', '::where', '->where', '::with', '->with', '::select', '->select',
-        '::join', '->join', '::orderBy', '->orderBy', '::latest', '->latest', '::oldest', '->oldest'
-    ]
-    service_tokens = ['->execute(', 'Action->', 'Service->']
+    def is_builder(line: str) -> bool:
+        # Heuristic: likely builder if any builder token present and no obvious service/action chaining
+        return bool(BUILDER_TOKEN_RE.search(line)) and not SERVICE_TOKEN_RE.search(line)
 
     for idx, line in enumerate(lines):
-        # Heuristic: likely builder if any builder token present and no obvious service/action chaining
-        is_builder = any(tok in line for tok in builder_tokens) and not any(tok in line for tok in service_tokens)
         # get()
         if GET_QUERY_RE.search(line) and not WITH_RE.search(line):
             # Heuristic: Avoid touching lines that look like raw DB::table
             if "DB::table(" in line or "->select(" in line:
                 continue
-            if not is_builder:
+            if not is_builder(line):
                 continue
             new_line = GET_QUERY_RE.sub(with_clause + "->get()", line)
             if new_line != line:
@@ -66,7 +73,7 @@ def _suggest_with_injection(lines: List[str], relations: List[str]) -> List[Tupl
         if PAGINATE_QUERY_RE.search(line) and not WITH_RE.search(line):
             if "DB::table(" in line or "->select(" in line:
                 continue
-            if not is_builder:
+            if not is_builder(line):
                 continue
             new_line = PAGINATE_QUERY_RE.sub(lambda m: with_clause + m.group(1), line)
             if new_line != line:
@@ -81,11 +88,13 @@ def scan_file_for_n_plus_one(file_path: str, content: str, known_relations: List
             # Merge and deduplicate, keep a small cap for suggestion clarity
             merged = []
             seen = set()
-            for r in (relations + list(known_relations)):
+            for r in itertools.chain(relations, known_relations):
                 if r and r not in seen:
                     seen.add(r)
                     merged.append(r)
-            relations = merged[:6]
+                    if len(merged) == 6:
+                        break
+            relations = merged
         lines = content.splitlines(keepends=True)
         suggestions = _suggest_with_injection(lines, relations)
 
@@ -6,7 +6,7 @@ import sublime
 import sublime_plugin
 
 from .context_analyzer import ContextAnalyzer
-from .project_indexer import build_project_index
+from .project_indexer import get_project_index, has_project_index, warm_project_index
 
 CLASS_NAME_RE = re.compile(r"^[A-Z][A-Za-z0-9_]*$")
 ASSIGN_CLASS_RE_TMPL = r"\${var}\s*=\s*([A-Za-z_\\\\][A-Za-z0-9_\\\\]*)::"
@@ -31,6 +31,9 @@ SEARCH_PATHS = [
 ]
 EXCLUDE_DIRS = {"vendor", "node_modules", ".git", "storage"}
 
+# (project_root, fqcn) -> resolved path; only hits are kept, re-checked on use
+_CLASS_PATH_CACHE: dict = {}
+
 
 def _resolve_blade_view_path(project_root: str, view_name: str) -> str | None:
     # Namespaced: vendor::path.name
@@ -58,6 +61,19 @@ def _find_project_root(view: sublime.View) -> str | None:
 
 
 def _resolve_class_to_path(project_root: str, fqcn: str) -> str | None:
+    key = (project_root, fqcn)
+    cached = _CLASS_PATH_CACHE.get(key)
+    if cached and os.path.exists(cached):
+        return cached
+    path = _find_class_path(project_root, fqcn)
+    if path:
+        _CLASS_PATH_CACHE[key] = path
+    else:
+        _CLASS_PATH_CACHE.pop(key, None)
+    return path
+
+
+def _find_class_path(project_root: str, fqcn: str) -> str | None:
     # Normalize backslashes
     parts = [p for p in fqcn.split("\\") if p]
     if not parts:
@@ -120,15 +136,19 @@ class LaravelWorkshopGotoDefinitionCommand(sublime_plugin.TextCommand):
             mr = ROUTE_CALL_RE.search(line_text)
             if mr:
                 rname = mr.group(1)
-                idx = build_project_index(project_root, max_workers=2, excludes=EXCLUDE_DIRS)
-                for r in idx.get("routes", {}).get("routes", []):
-                    if r.get("name") == rname:
+                if has_project_index(project_root):
+                    idx = get_project_index(project_root, max_workers=2, excludes=EXCLUDE_DIRS)
+                    for r in idx.get("routes_by_name", {}).get(rname, ()):
                         # open controller file
                         ctrl = r.get("controller") or ""
                         path = _resolve_class_to_path(project_root, ctrl)
                         if path:
                             self._open_file(path)
                             return
+                else:
+                    # Don't build the index on the UI thread; other lookups still run meanwhile
+                    warm_project_index(project_root, max_workers=2, excludes=EXCLUDE_DIRS)
+                    sublime.status_message("Go To Definition: indexing routes, try again shortly")
 
             # Case 0b: view()/@include('view.name') in PHP/Blade → open resources/views/view/name.blade.php
             mv = VIEW_CALL_RE.search(line_text) or INCLUDE_CALL_RE.search(line_text) or COMPONENT_CALL_RE.search(line_text) or EACH_CALL_RE.search(line_text)
@@ -231,3 +251,26 @@ class LaravelWorkshopGotoDefinitionCommand(sublime_plugin.TextCommand):
     def want_event(self):
         # Necessary to receive mouse event coordinates from mousemap
         return True
+
+
+class LaravelWorkshopProjectIndexListener(sublime_plugin.EventListener):
+    def on_post_save_async(self, view):
+        # Refresh a warm index in the background; mtime caching keeps this cheap
+        fname = view.file_name() or ""
+        if not fname.endswith(".php"):
+            return
+        project_root = _find_project_root(view)
+        if project_root and has_project_index(project_root):
+            warm_project_index(project_root, max_workers=2, excludes=EXCLUDE_DIRS)
+
+
+def _warm_open_projects():
+    for window in sublime.windows():
+        folders = window.folders()
+        if folders:
+            warm_project_index(folders[0], max_workers=2, excludes=EXCLUDE_DIRS)
+
+
+def plugin_loaded():
+    # Index open projects off the UI thread so the first lookup is served from memory
+    sublime.set_timeout_async(_warm_open_projects, 2000)
@@ -7,7 +7,9 @@ from typing import Dict, List, Any, Iterable, Tuple
 import json
 import hashlib
 import time
-import sublime
+
+from .settings_cache import get_setting
+from .worker_manager import get_worker_manager
 
 DEFAULT_EXCLUDES = {"vendor", "node_modules", ".git", "storage", "bootstrap", "build", "dist"}
 
@@ -33,6 +35,10 @@ ROUTE_STRING_CONTROLLER_RE = re.compile(
     re.IGNORECASE | re.DOTALL,
 )
 ROUTE_NAME_RE = re.compile(r"->\s*name\s*\(\s*['\"]([^'\"]+)['\"]\s*\)")
+CLASS_REF_RE = re.compile(r"([A-Za-z_][A-Za-z0-9_\\\\]+)::class")
+
+# project root -> most recently built index, served to latency-sensitive lookups
+_INDEX_MEMO: Dict[str, Dict[str, Any]] = {}
 
 
 def _list_php_files(root: str, subdir: str, excludes: Iterable[str]) -> List[str]:
@@ -78,7 +84,7 @@ def _extract_method_bodies(lines: List[str]) -> Dict[str, Tuple[int, int]]:
 
 def _parse_relation_target(snippet: str) -> str | None:
     # Try to find Foo::class within the snippet
-    m = re.search(r"([A-Za-z_][A-Za-z0-9_\\\\]+)::class", snippet)
+    m = CLASS_REF_RE.search(snippet)
     if m:
         return m.group(1).split('\\')[-1]
     return None
@@ -152,8 +158,7 @@ def _index_routes(root: str) -> Dict[str, Any]:
 
 
 def _cache_path_for_project(project_root: str) -> str:
-    settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
-    cache_dir = settings.get("cache_directory", os.path.expanduser("~/.sublime_ollama_cache"))
+    cache_dir = get_setting("cache_directory", os.path.expanduser("~/.sublime_ollama_cache"))
     try:
         cache_dir = os.path.expanduser(cache_dir)
     except Exception:
@@ -215,18 +220,37 @@ def build_project_index(project_root: str, max_workers: int = 8, excludes: Itera
                 if res:
                     model_index.append(res)
 
-    # Routes (no mtime cache for simplicity; route files are few)
-    routes_index = _index_routes(project_root)
+    # Routes: reparse only when a route file changed since the cached index
+    route_mtimes: Dict[str, float] = {}
+    for d, f in ROUTE_FILE_CANDIDATES:
+        p = os.path.join(project_root, d, f)
+        try:
+            route_mtimes[p] = os.path.getmtime(p)
+        except OSError:
+            continue
+    cached_routes = cache.get("routes")
+    if cached_routes is not None and cache.get("route_mtimes") == route_mtimes:
+        routes_index = cached_routes
+    else:
+        routes_index = _index_routes(project_root)
 
     # Quick maps
     relations_map = {m["model"]: m.get("relations", []) for m in model_index}
     relations_detail_map = {m["model"]: m.get("relations_detail", {}) for m in model_index}
+    # Distinct relation names across all models, first-seen order
+    known_relations = list(dict.fromkeys(r for rels in relations_map.values() for r in rels if r))
+    routes_by_name: Dict[str, List[Dict[str, str]]] = {}
+    for r in routes_index.get("routes", []):
+        if r.get("name"):
+            routes_by_name.setdefault(r["name"], []).append(r)
 
     out = {
         "models": model_index,
         "routes": routes_index,
         "relations_map": relations_map,
         "relations_detail": relations_detail_map,
+        "known_relations": known_relations,
+        "routes_by_name": routes_by_name,
         "stats": {
             "models": len(model_index),
             "routes": routes_index.get("count", 0),
@@ -234,11 +258,37 @@ def build_project_index(project_root: str, max_workers: int = 8, excludes: Itera
         "generated_at": int(time.time()),
     }
 
-    # Save cache
-    try:
-        cache_out = {"models": model_index, "mtimes": new_mtimes}
-        _save_cache(project_root, cache_out)
-    except Exception:
-        pass
+    # Save cache (skipped when every model and route file was unchanged)
+    if new_mtimes != cached_mtimes or routes_index is not cached_routes:
+        try:
+            cache_out = {"models": model_index, "mtimes": new_mtimes, "routes": routes_index, "route_mtimes": route_mtimes}
+            _save_cache(project_root, cache_out)
+        except Exception:
+            pass
 
+    _INDEX_MEMO[project_root] = out
     return out
+
+
+def get_project_index(project_root: str, max_workers: int = 4, excludes: Iterable[str] = None) -> Dict[str, Any]:
+    """Return the in-memory index for a project, building it only if none exists yet."""
+    idx = _INDEX_MEMO.get(project_root)
+    if idx is None:
+        idx = build_project_index(project_root, max_workers=max_workers, excludes=excludes)
+    return idx
+
+
+def has_project_index(project_root: str) -> bool:
+    return project_root in _INDEX_MEMO
+
+
+def warm_project_index(project_root: str, max_workers: int = 4, excludes: Iterable[str] = None):
+    """(Re)build the index in the background; concurrent requests per project are coalesced."""
+    return get_worker_manager().submit(
+        build_project_index,
+        project_root,
+        max_workers=max_workers,
+        excludes=excludes,
+        priority=2,
+        key=f"project_index:{project_root}",
+    )
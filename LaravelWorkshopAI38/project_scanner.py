@@ -10,34 +10,21 @@ DEFAULT_EXCLUDES = {"vendor", "node_modules", ".git", "storage", "bootstrap", "b
 SUPPORTED_EXTENSIONS = {".php", ".blade.php"}
 
 
-def _should_skip(path: str, project_root: str, excludes: Iterable[str]) -> bool:
-    rel = os.path.relpath(path, project_root)
-    parts = rel.split(os.sep)
-    for p in parts:
-        if p in excludes:
-            return True
-    return False
-
-
 def _is_supported_file(filename: str) -> bool:
-    if filename.endswith(".blade.php"):
-        return True
-    _, ext = os.path.splitext(filename)
-    return ext in {".php"}
+    # ".blade.php" is covered by the ".php" suffix
+    return filename.endswith(".php")
 
 
 def _collect_files(project_root: str, excludes: Iterable[str]) -> List[str]:
     files: List[str] = []
     for root, dirs, filenames in os.walk(project_root):
-        # Prune excluded dirs in-place for performance
+        # Prune excluded dirs in-place; no walked path can then contain one,
+        # so files need no per-path relpath check
         dirs[:] = [d for d in dirs if d not in excludes]
         for fname in filenames:
-            if not _is_supported_file(fname):
+            if not _is_supported_file(fname) or fname in excludes:
                 continue
-            full = os.path.join(root, fname)
-            if _should_skip(full, project_root, excludes):
-                continue
-            files.append(full)
+            files.append(os.path.join(root, fname))
     return files
 
 
@@ -46,6 +33,8 @@ def scan_project(project_root: str, max_workers: int = 8, excludes: Iterable[str
     targets = _collect_files(project_root, excludes)
 
     results: List[Dict[str, Any]] = []
+    diffs: List[Dict[str, Any]] = []
+    problematic_files: List[str] = []
 
     def _scan_one(path: str) -> Dict[str, Any]:
         try:
@@ -57,16 +46,15 @@ def scan_project(project_root: str, max_workers: int = 8, excludes: Iterable[str
 
     with ThreadPoolExecutor(max_workers=max_workers or 4) as ex:
         futs = {ex.submit(_scan_one, p): p for p in targets}
+        # Collect diffs and problem files as results arrive instead of re-walking results
         for fut in as_completed(futs):
             res = fut.result()
             results.append(res)
-
-    diffs: List[Dict[str, Any]] = []
-    for r in results:
-        for d in r.get("diffs", []) or []:
-            diffs.append(d)
-
-    problematic_files = [r["file"] for r in results if r.get("issues_found")]
+            file_diffs = res.get("diffs")
+            if file_diffs:
+                diffs.extend(file_diffs)
+            if res.get("issues_found"):
+                problematic_files.append(res["file"])
 
     summary = {
         "total_files": len(targets),
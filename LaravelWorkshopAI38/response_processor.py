@@ -1,5 +1,28 @@
 import re
 import html
+import threading
+
+import sublime
+
+# Fence patterns are compiled once; language-specific opening fences are cached per hint
+_CODE_BLOCK_RE = re.compile(r'```(?:[a-zA-Z]*)?\s*\n?(.*?)```', re.DOTALL)
+_FIRST_CODE_BLOCK_RE = re.compile(r'```(?:[a-zA-Z]*\n)?(.*?)```', re.DOTALL)
+_OPEN_FENCE_ANY_RE = re.compile(r'^```[a-zA-Z]*\s*\n?', re.MULTILINE)
+_OPEN_FENCE_BARE_RE = re.compile(r'^```\s*\n?', re.MULTILINE)
+_CLOSE_FENCE_TAIL_RE = re.compile(r'\n?```\s*$')
+_CLOSE_FENCE_LINE_RE = re.compile(r'^```\s*$', re.MULTILINE)
+_FENCE_RE_CACHE = {}
+
+
+def _open_fence_re(language_hint):
+    """Return the compiled opening-fence pattern for a language hint."""
+    pattern = _FENCE_RE_CACHE.get(language_hint)
+    if pattern is None:
+        pattern = _FENCE_RE_CACHE.setdefault(
+            language_hint,
+            re.compile(r'^```' + re.escape(language_hint) + r'\s*\n?', re.MULTILINE)
+        )
+    return pattern
 
 
 class ResponseProcessor:
@@ -20,26 +43,25 @@ class ResponseProcessor:
         cleaned = content.strip()
         
         # Try to extract code from markdown block first
-        code_block_pattern = r'```(?:[a-zA-Z]*)?\s*\n?(.*?)```'
-        match = re.search(code_block_pattern, cleaned, re.DOTALL)
+        match = _CODE_BLOCK_RE.search(cleaned)
         if match:
             # Found a code block, extract just the content
             cleaned = match.group(1)
         else:
             # Try to remove fencing without code block wrapper
             # Remove opening fences with language specifiers
-            fence_patterns = [
-                r'^```' + re.escape(language_hint) + r'\s*\n?',
-                r'^```[a-zA-Z]*\s*\n?',
-                r'^```\s*\n?'
-            ]
+            fence_patterns = (
+                _open_fence_re(language_hint),
+                _OPEN_FENCE_ANY_RE,
+                _OPEN_FENCE_BARE_RE
+            )
             
             for pattern in fence_patterns:
-                cleaned = re.sub(pattern, '', cleaned, flags=re.MULTILINE)
+                cleaned = pattern.sub('', cleaned)
             
             # Remove closing fences
-            cleaned = re.sub(r'\n?```\s*$', '', cleaned)
-            cleaned = re.sub(r'^```\s*$', '', cleaned, flags=re.MULTILINE)
+            cleaned = _CLOSE_FENCE_TAIL_RE.sub('', cleaned)
+            cleaned = _CLOSE_FENCE_LINE_RE.sub('', cleaned)
         
         return cleaned.strip()
     
@@ -52,8 +74,7 @@ class ResponseProcessor:
             return content
             
         # Look for code blocks within triple backticks
-        code_block_pattern = r'```(?:[a-zA-Z]*\n)?(.*?)```'
-        matches = re.findall(code_block_pattern, content, re.DOTALL)
+        matches = _FIRST_CODE_BLOCK_RE.findall(content)
         
         if matches:
             # Return the first (usually largest) code block
@@ -126,32 +147,89 @@ class StreamingResponseHandler:
     """
     Handles streaming responses from Ollama API.
     Manages state and content accumulation during streaming.
+
+    When a flush_callback is given, chunks are coalesced and handed to it in
+    batches: at most flush_interval seconds after the first buffered chunk
+    (one frame by default), or sooner once flush_size characters are pending,
+    instead of one UI edit per streamed token.
     """
     
-    def __init__(self, callback=None):
+    def __init__(self, callback=None, flush_callback=None, flush_size=4096, flush_interval=0.016):
         self.callback = callback
-        self.accumulated_content = ""
+        self.flush_callback = flush_callback
+        self.flush_size = flush_size
+        self.flush_interval = flush_interval
+        self._chunks = []
         self.is_complete = False
+        self._pending = []
+        self._pending_size = 0
+        self._flush_scheduled = False
+        self._lock = threading.Lock()
     
     def handle_chunk(self, content):
         """Handle a single chunk of streaming content."""
         if content:
-            self.accumulated_content += content
+            with self._lock:
+                self._chunks.append(content)
             if self.callback:
                 self.callback(content)
+            if self.flush_callback:
+                with self._lock:
+                    self._pending.append(content)
+                    self._pending_size += len(content)
+                    if self._pending_size >= self.flush_size:
+                        self._flush_pending()
+                    elif not self._flush_scheduled:
+                        self._flush_scheduled = True
+                        sublime.set_timeout(self._timed_flush, int(self.flush_interval * 1000))
+    
+    def flush(self):
+        """Hand any buffered chunks to the flush callback."""
+        with self._lock:
+            self._flush_pending()
+    
+    def _timed_flush(self):
+        """Flush the batch the frame timer was scheduled for."""
+        with self._lock:
+            self._flush_scheduled = False
+            self._flush_pending()
+    
+    def _flush_pending(self):
+        """Flush while holding the lock so batches reach the callback in order."""
+        if not self._pending:
+            return
+        text = "".join(self._pending)
+        self._pending = []
+        self._pending_size = 0
+        self.flush_callback(text)
     
     def handle_completion(self):
         """Handle completion of streaming response."""
+        if self.flush_callback:
+            self.flush()
         self.is_complete = True
     
+    @property
+    def accumulated_content(self):
+        return self.get_accumulated_content()
+    
     def get_accumulated_content(self):
         """Get the complete accumulated content."""
-        return self.accumulated_content
+        with self._lock:
+            chunks = self._chunks
+            if len(chunks) > 1:
+                # Join once and keep the result so repeated reads stay cheap;
+                # the lock keeps a concurrent handle_chunk from being dropped
+                chunks[:] = ["".join(chunks)]
+            return chunks[0] if chunks else ""
     
     def reset(self):
         """Reset the handler for reuse."""
-        self.accumulated_content = ""
         self.is_complete = False
+        with self._lock:
+            self._chunks = []
+            self._pending = []
+            self._pending_size = 0
 
 
 class ChatHistoryManager:
@@ -180,8 +258,8 @@ class ChatHistoryManager:
         self._trim_history()
     
     def get_messages_for_api(self):
-        """Get messages formatted for API request."""
-        return self.history.copy()
+        """Get messages formatted for API request (live list, treat as read-only)."""
+        return self.history
     
     def get_conversation_messages_only(self):
         """Get only user and assistant messages (excluding system)."""
@@ -193,15 +271,12 @@ class ChatHistoryManager:
     
     def _trim_history(self):
         """Trim history to maximum length, preserving system messages."""
-        if len(self.history) <= self.max_history_length:
-            return
-            
-        # Separate system messages from conversation
-        system_messages = [msg for msg in self.history if msg["role"] == "system"]
-        conversation_messages = [msg for msg in self.history if msg["role"] != "system"]
-        
-        # Keep only the most recent conversation messages
-        recent_conversation = conversation_messages[-(self.max_history_length - len(system_messages)):]
-        
-        # Rebuild history with system messages first
-        self.history = system_messages + recent_conversation
\ No newline at end of file
+        history = self.history
+        while len(history) > self.max_history_length:
+            # Drop the oldest conversation message in place
+            for index, msg in enumerate(history):
+                if msg["role"] != "system":
+                    del history[index]
+                    break
+            else:
+                return
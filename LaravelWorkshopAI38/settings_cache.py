@@ -0,0 +1,47 @@
+"""
+Shared, memoized access to LaravelWorkshopAI.sublime-settings.
+
+The Settings object is loaded on first use and every value read through
+get_setting() is kept until Sublime reports that the settings changed.
+Returned lists/dicts are shared between callers and must not be mutated.
+"""
+
+import sublime
+
+SETTINGS_FILE = "LaravelWorkshopAI.sublime-settings"
+_ON_CHANGE_KEY = "laravel_workshop_settings_cache"
+
+_state = {'settings': None}
+_values = {}
+
+
+def get_settings():
+    """Return the package Settings object, loading it once."""
+    settings = _state['settings']
+    if settings is None:
+        settings = sublime.load_settings(SETTINGS_FILE)
+        settings.add_on_change(_ON_CHANGE_KEY, _values.clear)
+        _state['settings'] = settings
+    return settings
+
+
+def get_setting(key, default=None):
+    """Return a setting value, served from memory after the first read."""
+    if key not in _values:
+        _values[key] = get_settings().get(key)
+    value = _values[key]
+    return default if value is None else value
+
+
+def clear_settings_cache():
+    """Forget cached values and detach from the Settings object."""
+    settings = _state['settings']
+    if settings is not None:
+        settings.clear_on_change(_ON_CHANGE_KEY)
+        _state['settings'] = None
+    _values.clear()
+
+
+def plugin_unloaded():
+    # Detach the on_change hook and drop stale values on package reload/disable
+    clear_settings_cache()
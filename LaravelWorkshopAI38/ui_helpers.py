@@ -1,5 +1,34 @@
 import sublime
 import os
+import weakref
+
+# Static overlay markup; only the escaped suggestion is filled in per render
+_OVERLAY_TEMPLATE = """
+        <div style="background: #2d3748; border: 2px solid #4299e1; border-radius: 8px; padding: 16px; margin: 8px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
+            <div style="color: #e2e8f0; font-size: 14px; margin-bottom: 12px;">
+                <strong>🤖 AI Refactoring Suggestion</strong>
+            </div>
+            
+            <div style="background: #1a202c; border-radius: 4px; padding: 12px; margin-bottom: 12px; border-left: 4px solid #4299e1;">
+                <div style="color: #a0aec0; font-size: 12px; margin-bottom: 8px;">SUGGESTED CODE:</div>
+                <div style="color: #e2e8f0; font-family: 'Monaco', 'Menlo', monospace; font-size: 13px; line-height: 1.4; white-space: pre-wrap;">{suggestion}</div>
+            </div>
+            
+            <div style="display: flex; gap: 8px; justify-content: flex-end;">
+                <a href="approve" style="background: #48bb78; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">✅ Approve</a>
+                <a href="dismiss" style="background: #e53e3e; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">❌ Dismiss</a>
+                <a href="edit" style="background: #ed8936; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">✏️ Edit</a>
+            </div>
+            
+            <div style="color: #a0aec0; font-size: 11px; margin-top: 8px; text-align: center;">
+                Click buttons above to apply, dismiss, or edit the suggestion
+            </div>
+        </div>
+        """
+
+# view id -> PhantomSet shared by every refactoring overlay shown in that view
+_PHANTOM_SETS = weakref.WeakValueDictionary()
+_PHANTOM_SET_KEY = "laravel_workshop_refactor"
 
 
 class RefactoringOverlay:
@@ -9,21 +38,26 @@ class RefactoringOverlay:
         self.view = view
         self.original_text = original_text
         self.suggested_text = suggested_text
-        self.overlay_key = "laravel_workshop_refactor_{0}".format(id(self))
+        self.overlay_key = _PHANTOM_SET_KEY
         self.is_active = False
+        self._escaped = None
         
     def show(self):
         """Show the refactoring overlay with enhanced UI."""
         if self.is_active:
             return
             
-        # Create a phantom overlay with better styling
-        phantom_set = sublime.PhantomSet(self.view, self.overlay_key)
-        
         # Get the selection region
         selection = self.view.sel()[0] if self.view.sel() else None
         if not selection or selection.empty():
             return
+        
+        # Reuse the view's phantom set; a new suggestion replaces the previous one
+        view_id = self.view.id()
+        phantom_set = _PHANTOM_SETS.get(view_id)
+        if phantom_set is None:
+            phantom_set = sublime.PhantomSet(self.view, self.overlay_key)
+            _PHANTOM_SETS[view_id] = phantom_set
             
         # Create enhanced HTML content
         html_content = self._create_overlay_html()
@@ -44,28 +78,11 @@ class RefactoringOverlay:
         
     def _create_overlay_html(self):
         """Create enhanced HTML for the refactoring overlay."""
-        return """
-        <div style="background: #2d3748; border: 2px solid #4299e1; border-radius: 8px; padding: 16px; margin: 8px; box-shadow: 0 4px 6px rgba(0, 0, 0, 0.1);">
-            <div style="color: #e2e8f0; font-size: 14px; margin-bottom: 12px;">
-                <strong>🤖 AI Refactoring Suggestion</strong>
-            </div>
-            
-            <div style="background: #1a202c; border-radius: 4px; padding: 12px; margin-bottom: 12px; border-left: 4px solid #4299e1;">
-                <div style="color: #a0aec0; font-size: 12px; margin-bottom: 8px;">SUGGESTED CODE:</div>
-                <div style="color: #e2e8f0; font-family: 'Monaco', 'Menlo', monospace; font-size: 13px; line-height: 1.4; white-space: pre-wrap;">{self._escape_html(self.suggested_text)}</div>
-            </div>
-            
-            <div style="display: flex; gap: 8px; justify-content: flex-end;">
-                <a href="approve" style="background: #48bb78; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">✅ Approve</a>
-                <a href="dismiss" style="background: #e53e3e; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">❌ Dismiss</a>
-                <a href="edit" style="background: #ed8936; color: white; padding: 8px 16px; border-radius: 4px; text-decoration: none; font-weight: bold; font-size: 13px;">✏️ Edit</a>
-            </div>
-            
-            <div style="color: #a0aec0; font-size: 11px; margin-top: 8px; text-align: center;">
-                Click buttons above to apply, dismiss, or edit the suggestion
-            </div>
-        </div>
-        """
+        # Escape the suggestion once; re-renders reuse the cached markup
+        if self._escaped is None:
+            self._escaped = self._escape_html(self.suggested_text)
+        
+        return _OVERLAY_TEMPLATE.format(suggestion=self._escaped)
     
     def _escape_html(self, text):
         """Escape HTML special characters."""
@@ -137,6 +154,7 @@ class RefactoringOverlay:
         if hasattr(self, 'phantom_set'):
             self.phantom_set.update([])
         self.is_active = False
+        self._escaped = None
     
     def cleanup(self):
         """Clean up resources."""
@@ -180,11 +198,7 @@ class UIHelpers:
     @staticmethod
     def get_selected_text(view):
         """Get all selected text from a view, concatenated."""
-        selected_text = ""
-        for region in view.sel():
-            if not region.empty():
-                selected_text += view.substr(region)
-        return selected_text
+        return "".join(view.substr(region) for region in view.sel() if not region.empty())
     
     @staticmethod
     def has_selection(view):
@@ -8,10 +8,150 @@ Universal API Client - Supports multiple AI providers
 
 import sublime
 import json
+import gzip
+import hashlib
+import http.client
+import threading
 import urllib.request
 import urllib.error
+from collections import OrderedDict
+from concurrent.futures import Future
+from contextlib import contextmanager
+from urllib.parse import urlsplit
 from typing import Callable, Optional, Dict, Any
 
+# orjson is a much faster drop-in for the per-chunk parsing when it is installed;
+# its JSONDecodeError subclasses json.JSONDecodeError, so callers catch either
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps_json(payload):
+    """Serialize a request payload to UTF-8 JSON bytes."""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def loads_json(data):
+    """Parse JSON from bytes or str."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+# Fixed system instructions, built once and shared by every payload
+_LARAVEL_SYSTEM_PROMPT = "You are a helpful coding assistant specialized in Laravel PHP development."
+_LARAVEL_SYSTEM_MESSAGE = {"role": "system", "content": _LARAVEL_SYSTEM_PROMPT}
+_CUSTOM_SYSTEM_MESSAGE = {"role": "system", "content": "You are a helpful coding assistant."}
+_GEMINI_PROMPT_PREFIX = _LARAVEL_SYSTEM_PROMPT + "\n\n"
+
+# Blocking responses keyed by a hash of endpoint + payload, shared by all clients
+# (they are created per command); identical prompts skip the model entirely
+_RESPONSE_CACHE_SIZE = 128
+_response_cache = OrderedDict()
+_response_cache_lock = threading.Lock()
+# Identical blocking requests already on the wire; later callers wait for the first
+_inflight_requests = {}
+
+
+def _response_cache_key(endpoint, body):
+    key = hashlib.blake2b(digest_size=16)
+    key.update(endpoint.encode('utf-8'))
+    key.update(b'\0')
+    key.update(body)
+    return key.digest()
+
+
+def _cached_response(key):
+    with _response_cache_lock:
+        response = _response_cache.get(key)
+        if response is not None:
+            _response_cache.move_to_end(key)
+        return response
+
+
+def _cache_response(key, response):
+    with _response_cache_lock:
+        _response_cache[key] = response
+        _response_cache.move_to_end(key)
+        if len(_response_cache) > _RESPONSE_CACHE_SIZE:
+            _response_cache.popitem(last=False)
+
+
+def clear_response_cache():
+    """Forget all cached blocking responses."""
+    with _response_cache_lock:
+        _response_cache.clear()
+
+
+def read_response_body(response):
+    """Read a whole response body, inflating it if the server sent it gzipped."""
+    body = response.read()
+    if response.headers.get("Content-Encoding", "").lower() == "gzip":
+        body = gzip.decompress(body)
+    return body
+
+
+def extract_json_string_field(line, marker):
+    """Read a plain string field straight from a raw JSON line.
+    
+    marker is the encoded key up to the opening quote, e.g. b'"response":"'.
+    Returns None when the field is absent or its value holds escapes, so the
+    caller falls back to a full parse; the common per-token line needs none."""
+    index = line.find(marker)
+    if index == -1:
+        return None
+    start = index + len(marker)
+    end = line.find(b'"', start)
+    if end == -1 or line.find(b'\\', start, end) != -1:
+        return None
+    return line[start:end].decode('utf-8')
+
+
+class _HTTPStatusError(Exception):
+    """Non-2xx response from the provider"""
+    
+    def __init__(self, code, body):
+        super().__init__("HTTP {0}".format(code))
+        self.code = code
+        self.body = body
+
+
+def iter_response_lines(response, chunk_size=8192):
+    """Yield complete lines (without the newline) from a streaming HTTP response.
+    
+    read1() returns whatever has arrived (up to chunk_size) without waiting
+    for a full buffer, so tokens are not delayed; several lines that arrive
+    together are split from one read instead of one readline() each."""
+    read = getattr(response, "read1", None) or response.read
+    buf = bytearray()
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            break
+        buf += chunk
+        start = 0
+        while True:
+            nl = buf.find(b"\n", start)
+            if nl == -1:
+                break
+            yield bytes(buf[start:nl])
+            start = nl + 1
+        del buf[:start]
+    if buf:
+        yield bytes(buf)
+
+
+def _proxy_for(parts):
+    """Return the configured proxy for a URL, if urllib would route it through one"""
+    proxy = urllib.request.getproxies().get(parts.scheme)
+    if proxy and not urllib.request.proxy_bypass(parts.hostname or ""):
+        return proxy
+    return None
+
 
 class UniversalAPIClient:
     """Universal API client that supports multiple AI providers"""
@@ -19,6 +159,8 @@ class UniversalAPIClient:
     def __init__(self, provider = "ollama"):
         self.provider = provider
         self.settings = sublime.load_settings("LaravelWorkshopAI.sublime-settings")
+        # Keep-alive connections, one per thread and host (clients are shared across threads)
+        self._local = threading.local()
         self._load_config()
     
     def _load_config(self):
@@ -30,6 +172,7 @@ class UniversalAPIClient:
             self.model = provider_config.get("model", "qwen2.5-coder:14b")
             self.timeout = provider_config.get("timeout", 120)
             self.stream = provider_config.get("stream", True)
+            self.keep_alive = provider_config.get("keep_alive", "5m")
             self.api_key = None
             self.headers = {"Content-Type": "application/json"}
             
@@ -74,6 +217,8 @@ class UniversalAPIClient:
             self.stream = provider_config.get("stream", True)
             self.api_key = provider_config.get("api_key", "")
             self.api_format = provider_config.get("api_format", "openai")
+            # Only sent when configured; other servers may reject unknown fields
+            self.keep_alive = provider_config.get("keep_alive")
             
             if not self.base_url:
                 raise ValueError("Custom server base_url is required")
@@ -90,6 +235,26 @@ class UniversalAPIClient:
         
         else:
             raise ValueError("Unknown provider: {0}".format(self.provider))
+        
+        # Ollama streams newline-delimited JSON, OpenAI/Gemini stream SSE;
+        # ask proxies not to cache or buffer either so tokens arrive as sent
+        if self.provider == "ollama" or (self.provider == "custom" and self.api_format == "ollama"):
+            accept = "application/x-ndjson"
+        else:
+            accept = "text/event-stream"
+        self.stream_headers = dict(self.headers)
+        self.stream_headers.update({
+            "Accept": accept,
+            "Cache-Control": "no-cache"
+        })
+        # Whole (non-streamed) bodies may come back compressed; streams stay
+        # identity-encoded so each token can be read as soon as it arrives
+        self.headers.setdefault("Accept-Encoding", "gzip")
+        # Provider settings are fixed per client, so the URL is too
+        self.endpoint = self._get_endpoint()
+        # Ollama token lines are read without a JSON parse when they allow it
+        self._stream_field = b'"response":"' if accept == "application/x-ndjson" else None
+        self.cache_responses = self.settings.get("cache_ai_responses", True)
     
     def _build_request_payload(self, prompt):
         """Build request payload based on provider"""
@@ -98,14 +263,15 @@ class UniversalAPIClient:
             return {
                 "model": self.model,
                 "prompt": prompt,
-                "stream": self.stream
+                "stream": self.stream,
+                "keep_alive": self.keep_alive
             }
         
         elif self.provider == "openai":
             return {
                 "model": self.model,
                 "messages": [
-                    {"role": "system", "content": "You are a helpful coding assistant specialized in Laravel PHP development."},
+                    _LARAVEL_SYSTEM_MESSAGE,
                     {"role": "user", "content": prompt}
                 ],
                 "temperature": self.temperature,
@@ -118,7 +284,7 @@ class UniversalAPIClient:
                 "contents": [
                     {
                         "parts": [
-                            {"text": "You are a helpful coding assistant specialized in Laravel PHP development.\n\n{0}".format(prompt)}
+                            {"text": _GEMINI_PROMPT_PREFIX + prompt}
                         ]
                     }
                 ],
@@ -134,17 +300,20 @@ class UniversalAPIClient:
                 return {
                     "model": self.model,
                     "messages": [
-                        {"role": "system", "content": "You are a helpful coding assistant."},
+                        _CUSTOM_SYSTEM_MESSAGE,
                         {"role": "user", "content": prompt}
                     ],
                     "stream": self.stream
                 }
             else:  # ollama format
-                return {
+                payload = {
                     "model": self.model,
                     "prompt": prompt,
                     "stream": self.stream
                 }
+                if self.keep_alive is not None:
+                    payload["keep_alive"] = self.keep_alive
+                return payload
     
     def _get_endpoint(self):
         """Get API endpoint based on provider"""
@@ -176,7 +345,7 @@ class UniversalAPIClient:
         
         try:
             if self.provider == "ollama" or (self.provider == "custom" and self.api_format == "ollama"):
-                data = json.loads(line)
+                data = loads_json(line)
                 return data.get("response", "")
             
             elif self.provider == "openai" or (self.provider == "custom" and self.api_format == "openai"):
@@ -187,7 +356,7 @@ class UniversalAPIClient:
                 if line.strip() == "[DONE]":
                     return None
                 
-                data = json.loads(line)
+                data = loads_json(line)
                 choices = data.get("choices", [])
                 if choices:
                     delta = choices[0].get("delta", {})
@@ -200,7 +369,7 @@ class UniversalAPIClient:
                 if line.startswith("data: "):
                     line = line[6:]
                 
-                data = json.loads(line)
+                data = loads_json(line)
                 candidates = data.get("candidates", [])
                 if candidates:
                     content = candidates[0].get("content", {})
@@ -213,32 +382,99 @@ class UniversalAPIClient:
         except json.JSONDecodeError:
             return None
     
+    def _connection(self, parts):
+        """Return (connection, reused) for this thread and the URL's host"""
+        pool = getattr(self._local, "connections", None)
+        if pool is None:
+            pool = self._local.connections = {}
+        key = (parts.scheme, parts.netloc)
+        conn = pool.get(key)
+        if conn is not None:
+            return conn, True
+        if parts.scheme == "https":
+            conn = http.client.HTTPSConnection(parts.hostname, parts.port, timeout=self.timeout)
+        else:
+            conn = http.client.HTTPConnection(parts.hostname, parts.port, timeout=self.timeout)
+        pool[key] = conn
+        return conn, False
+    
+    def _drop_connection(self, parts):
+        conn = getattr(self._local, "connections", {}).pop((parts.scheme, parts.netloc), None)
+        if conn is not None:
+            conn.close()
+    
+    @contextmanager
+    def _post(self, endpoint, body, headers):
+        """POST an encoded JSON body and yield the response, reusing this thread's connection to the host.
+        
+        The connection is kept only if the response was read to the end."""
+        parts = urlsplit(endpoint)
+        
+        if _proxy_for(parts):
+            # Let urllib handle proxied requests (one connection per request)
+            request = urllib.request.Request(endpoint, data=body, headers=headers, method='POST')
+            try:
+                response = urllib.request.urlopen(request, timeout=self.timeout)
+            except urllib.error.HTTPError as e:
+                raise _HTTPStatusError(e.code, read_response_body(e).decode('utf-8', 'replace'))
+            with response:
+                yield response
+            return
+        
+        path = parts.path or "/"
+        if parts.query:
+            path = "{0}?{1}".format(path, parts.query)
+        
+        while True:
+            conn, reused = self._connection(parts)
+            try:
+                conn.request("POST", path, body=body, headers=headers)
+                response = conn.getresponse()
+                break
+            except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                self._drop_connection(parts)
+                if not reused:
+                    raise
+                # Server closed an idle keep-alive connection; retry once on a fresh one
+            except BaseException:
+                self._drop_connection(parts)
+                raise
+        
+        try:
+            if response.status >= 400:
+                raise _HTTPStatusError(response.status, read_response_body(response).decode('utf-8', 'replace'))
+            yield response
+        finally:
+            if not response.isclosed():
+                # Partially read (error or early exit): the connection can't be reused
+                self._drop_connection(parts)
+    
     def make_streaming_request(self, prompt, callback):
         """Make streaming request to AI provider"""
         
-        endpoint = self._get_endpoint()
+        endpoint = self.endpoint
         payload = self._build_request_payload(prompt)
         
-        request = urllib.request.Request(
-            endpoint,
-            data=json.dumps(payload).encode('utf-8'),
-            headers=self.headers,
-            method='POST'
-        )
+        stream_field = self._stream_field
         
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                for line in response:
+            with self._post(endpoint, dumps_json(payload), self.stream_headers) as response:
+                for line in iter_response_lines(response):
+                    if stream_field is not None:
+                        content = extract_json_string_field(line, stream_field)
+                        if content is not None:
+                            if content:
+                                callback(content)
+                            continue
                     line = line.decode('utf-8').strip()
                     content = self._parse_response_chunk(line)
                     if content:
                         callback(content)
         
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8')
-            raise Exception("HTTP {0}: {1}".format(e.code, error_body))
+        except _HTTPStatusError as e:
+            raise Exception("HTTP {0}: {1}".format(e.code, e.body))
         
-        except urllib.error.URLError as e:
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
             raise Exception("Connection error: {0}".format(str(e)))
         
         except Exception as e:
@@ -247,52 +483,78 @@ class UniversalAPIClient:
     def make_blocking_request(self, prompt):
         """Make blocking request to AI provider"""
         
-        endpoint = self._get_endpoint()
+        endpoint = self.endpoint
         payload = self._build_request_payload(prompt)
         
         # Disable streaming for blocking request (except Gemini which handles it differently)
         if self.provider != "gemini":
             payload["stream"] = False
         
-        request = urllib.request.Request(
-            endpoint,
-            data=json.dumps(payload).encode('utf-8'),
-            headers=self.headers,
-            method='POST'
-        )
+        # Serialized once: the same bytes are hashed for the cache and sent
+        body = dumps_json(payload)
+        key = _response_cache_key(endpoint, body)
+        if self.cache_responses:
+            cached = _cached_response(key)
+            if cached is not None:
+                return cached
+        
+        with _response_cache_lock:
+            future = _inflight_requests.get(key)
+            owner = future is None
+            if owner:
+                future = _inflight_requests[key] = Future()
+        if not owner:
+            return future.result()
         
         try:
-            with urllib.request.urlopen(request, timeout=self.timeout) as response:
-                data = json.loads(response.read().decode('utf-8'))
-                
-                if self.provider == "ollama" or (self.provider == "custom" and self.api_format == "ollama"):
-                    return data.get("response", "")
-                
-                elif self.provider == "openai" or (self.provider == "custom" and self.api_format == "openai"):
-                    choices = data.get("choices", [])
-                    if choices:
-                        message = choices[0].get("message", {})
-                        return message.get("content", "")
-                    return ""
-                
-                elif self.provider == "gemini":
-                    candidates = data.get("candidates", [])
-                    if candidates:
-                        content = candidates[0].get("content", {})
-                        parts = content.get("parts", [])
-                        if parts:
-                            return parts[0].get("text", "")
-                    return ""
-        
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode('utf-8')
-            raise Exception("HTTP {0}: {1}".format(e.code, error_body))
-        
-        except urllib.error.URLError as e:
+            result = self._send_blocking_request(endpoint, body)
+            if self.cache_responses and result:
+                _cache_response(key, result)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with _response_cache_lock:
+                _inflight_requests.pop(key, None)
+    
+    def _send_blocking_request(self, endpoint, body):
+        """POST a non-streaming request and return the completion text"""
+        try:
+            with self._post(endpoint, body, self.headers) as response:
+                data = loads_json(read_response_body(response))
+            return self._extract_blocking_content(data)
+        
+        except _HTTPStatusError as e:
+            raise Exception("HTTP {0}: {1}".format(e.code, e.body))
+        
+        except (urllib.error.URLError, http.client.HTTPException, OSError) as e:
             raise Exception("Connection error: {0}".format(str(e)))
         
         except Exception as e:
             raise Exception("Request failed: {0}".format(str(e)))
+    
+    def _extract_blocking_content(self, data):
+        """Pull the completion text out of a non-streaming response body"""
+        if self.provider == "ollama" or (self.provider == "custom" and self.api_format == "ollama"):
+            return data.get("response", "")
+        
+        elif self.provider == "openai" or (self.provider == "custom" and self.api_format == "openai"):
+            choices = data.get("choices", [])
+            if choices:
+                message = choices[0].get("message", {})
+                return message.get("content", "")
+            return ""
+        
+        elif self.provider == "gemini":
+            candidates = data.get("candidates", [])
+            if candidates:
+                content = candidates[0].get("content", {})
+                parts = content.get("parts", [])
+                if parts:
+                    return parts[0].get("text", "")
+            return ""
 
 
 def create_universal_api_client():
@@ -7,15 +7,16 @@ from typing import Callable, Any, Dict, Optional, Tuple
 
 
 class _Task:
-    __slots__ = ("priority", "seq", "key", "fn", "args", "kwargs")
+    __slots__ = ("priority", "seq", "key", "fn", "args", "kwargs", "future")
 
-    def __init__(self, priority: int, seq: int, key: Optional[str], fn: Callable, args: tuple, kwargs: dict):
+    def __init__(self, priority: int, seq: int, key: Optional[str], fn: Optional[Callable], args: tuple, kwargs: dict, future: Optional[Future] = None):
         self.priority = priority
         self.seq = seq
         self.key = key
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
+        self.future = future
 
     def __lt__(self, other: "_Task"):
         # lower priority value comes first, then FIFO by seq
@@ -36,34 +37,70 @@ class WorkerManager:
         self._seq = 0
         self._lock = threading.Lock()
         self._dispatcher_started = False
+        self._closed = False
 
     def submit(self, fn: Callable[..., Any], *args, priority: int = 1, key: Optional[str] = None, **kwargs) -> Future:
         with self._lock:
+            if self._closed:
+                raise RuntimeError("WorkerManager has been shut down")
             if key and key in self._inflight:
                 return self._inflight[key]
             self._seq += 1
-            task = _Task(priority=priority, seq=self._seq, key=key, fn=fn, args=args, kwargs=kwargs)
             fut: Future = Future()
+            task = _Task(priority=priority, seq=self._seq, key=key, fn=fn, args=args, kwargs=kwargs, future=fut)
             if key:
                 self._inflight[key] = fut
             self._queue.put(task)
             self._ensure_dispatcher()
             return fut
 
+    def is_inflight(self, key: str) -> bool:
+        """True while a task submitted with this key is queued or running."""
+        with self._lock:
+            return key in self._inflight
+
     def _ensure_dispatcher(self):
         if self._dispatcher_started:
             return
         self._dispatcher_started = True
         threading.Thread(target=self._dispatch_loop, name="LWAI-Dispatcher", daemon=True).start()
 
+    def shutdown(self):
+        """Stop dispatching and let the pool threads exit; queued tasks are cancelled."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            started = self._dispatcher_started
+            if started:
+                # Sentinel sorts ahead of every real task
+                self._queue.put(_Task(priority=-1, seq=0, key=None, fn=None, args=(), kwargs={}))
+        if not started:
+            self._cancel_queued()
+        self._executor.shutdown(wait=False)
+
+    def _cancel_queued(self):
+        while not self._queue.empty():
+            task = self._queue.get_nowait()
+            if task.future is not None:
+                task.future.cancel()
+        with self._lock:
+            self._inflight.clear()
+
     def _dispatch_loop(self):
         while True:
             task: _Task = self._queue.get()
+            if task.fn is None:
+                self._cancel_queued()
+                return
             # schedule on executor and wire completion to our Future + inflight cleanup
-            outer_future: Future
-            with self._lock:
-                outer_future = self._inflight.get(task.key) if task.key else None
-            inner_future = self._executor.submit(task.fn, *task.args, **task.kwargs)
+            outer_future = task.future
+            try:
+                inner_future = self._executor.submit(task.fn, *task.args, **task.kwargs)
+            except RuntimeError as e:  # executor already shut down
+                if outer_future is not None and not outer_future.done():
+                    outer_future.set_exception(e)
+                continue
 
             def _on_done(_inner: Future, _task: _Task, _outer: Optional[Future]):
                 try:
@@ -91,3 +128,16 @@ def get_worker_manager(max_workers: int = 8) -> WorkerManager:
             if _singleton is None:
                 _singleton = WorkerManager(max_workers=max_workers)
     return _singleton
+
+
+def shutdown_worker_manager():
+    global _singleton
+    with _singleton_lock:
+        manager, _singleton = _singleton, None
+    if manager is not None:
+        manager.shutdown()
+
+
+def plugin_unloaded():
+    # Release pool threads on package reload/disable instead of leaking them
+    shutdown_worker_manager()